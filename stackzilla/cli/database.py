@@ -4,6 +4,7 @@ import pprint
 import click
 
 from stackzilla.cli.utils import get_resource_from_path
+from stackzilla.database.base import StackzillaDB
 
 from .options import path_option
 
@@ -22,3 +23,10 @@ def show_resource(path):
     print(f'Version: {resource.version()}')
     print(f'Saved version: {resource.saved_version()}')
     pprint.pprint(resource.__dict__)
+
+@database.command('vacuum')
+def vacuum():
+    """Compact the database and refresh its query statistics."""
+    StackzillaDB.db.open()
+    StackzillaDB.db.vacuum()
+    StackzillaDB.db.close()
@@ -1,7 +1,7 @@
 """Abstract base class for all database interfaces."""
 import typing
 from abc import ABC, abstractmethod
-from typing import Any, List, Optional, Type
+from typing import Any, ContextManager, Iterable, List, Optional, Tuple, Type
 
 if typing.TYPE_CHECKING:
     from stackzilla.resource import StackzillaResource
@@ -62,6 +62,22 @@ class StackzillaDBBase(ABC):
             DatabaseNotFound: When there is no open database connection.
         """
 
+    @abstractmethod
+    def vacuum(self) -> None:
+        """Perform maintenance on the database, reclaiming unused space and refreshing any statistics.
+
+        Raises:
+            DatabaseNotOpen: When there is no open database connection.
+        """
+
+    @abstractmethod
+    def transaction(self) -> ContextManager[None]:
+        """Context manager which commits all database operations within the block as a single transaction.
+
+        Raises:
+            DatabaseCommitError: Raised if the commit fails.
+        """
+
     ###############################################################################
     # Methods for interacting with StackzillaResource objects
     ###############################################################################
@@ -73,6 +89,14 @@ class StackzillaDBBase(ABC):
             resource (StackzillaResource): The resource to serialize to the database
         """
 
+    @abstractmethod
+    def create_resources(self, resources: Iterable['StackzillaResource']) -> None:
+        """Create multiple resources in the database, in a single transaction.
+
+        Args:
+            resources (Iterable[StackzillaResource]): The resources to serialize to the database
+        """
+
     @abstractmethod
     def get_resource(self, path: str) -> 'StackzillaResource':
         """Query the database for a single resource.
@@ -126,6 +150,18 @@ class StackzillaDBBase(ABC):
             AttributeNotFound: Raised if the attribute is not found.
         """
 
+    @abstractmethod
+    def create_attributes(self, resource: 'StackzillaResource', items: Iterable[Tuple[str, Any]]) -> None:
+        """Create multiple attributes for an existing resource in a single transaction.
+
+        Args:
+            resource (StackzillaResource): The resource that the attributes belong to
+            items (Iterable[Tuple[str, Any]]): (name, value) pairs for each attribute to create
+
+        Raises:
+            DuplicateAttribute: Raised if any of the attributes already exist.
+        """
+
     @abstractmethod
     def delete_attribute(self, resource: 'StackzillaResource', name: str):
         """Delete an attribute previously added to the database.
@@ -1,40 +1,72 @@
 """SQLite database provider."""
+# The provider implements the whole StackzillaDBBase interface in one class. The SQL and connection setup live in
+# sqlite_sql.py, what remains is the per-method query logic.
+# pylint: disable=too-many-lines
 import base64
 import importlib
 import json
+import math
 import os
 import pickle
 import sqlite3
 import sys
 from contextlib import contextmanager
 from sqlite3 import Connection, Cursor
-from threading import Lock
-from typing import Any, Dict, List, Optional
+from threading import Lock, RLock, get_ident, local
+from types import ModuleType
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Type, Union
 
 from stackzilla.database.base import StackzillaDB, StackzillaDBBase
 from stackzilla.database.exceptions import (AttributeNotFound,
                                             BlueprintModuleNotFound,
                                             BlueprintPackageNotFound,
+                                            CreateAttributeFailure,
                                             CreateBlueprintModuleFailure,
                                             CreateBlueprintPackageFaiure,
                                             CreateResourceFailure,
                                             DatabaseCommitError,
                                             DatabaseExists, DatabaseNotFound,
                                             DatabaseNotOpen,
+                                            DuplicateAttribute,
                                             DuplicateBlueprintModule,
                                             DuplicateBlueprintPackage,
                                             MetadataKeyNotFound,
                                             ResourceNotFound)
+from stackzilla.database.sqlite_sql import (ATTRIBUTE_INSERT_ROWS,
+                                            METADATA_TABLE_NAME,
+                                            SQL_CHECK_METADATA,
+                                            SQL_CREATE_ATTRIBUTE_LOOKUP_INDEX,
+                                            SQL_CREATE_SCHEMA,
+                                            SQL_DELETE_METADATA,
+                                            SQL_GET_METADATA,
+                                            SQL_INSERT_ATTRIBUTES,
+                                            SQL_INSERT_ATTRIBUTES_FULL,
+                                            SQL_SET_METADATA,
+                                            STATEMENT_CACHE_SIZE,
+                                            configure_connection,
+                                            migrate_attribute_index,
+                                            migrate_metadata)
 from stackzilla.logger.core import CoreLogger
 from stackzilla.resource import StackzillaResource
 from stackzilla.resource.base import ResourceVersion
 
 
-# pylint: disable=too-many-public-methods
+# The instance attributes are the connection, transaction, reader connection, and cache state. Each needs its own lock
+# or bookkeeping, so they aren't grouped any further.
+# pylint: disable=too-many-public-methods,too-many-instance-attributes
 class StackzillaSQLiteDB(StackzillaDBBase):
     """Concrete implementation of SQLite."""
 
-    MetadataTableName = 'metadata'
+    MetadataTableName = METADATA_TABLE_NAME
+
+    # Metadata values of these exact types are stored as-is, tagged with the type name. Everything else
+    # (including bool, which would otherwise come back as an int) is stored as JSON.
+    MetadataNativeTypes = {int: 'int', float: 'float', str: 'str'}
+
+    # SQLite INTEGER columns are signed 64-bit. Ints outside this range (and non-finite floats) also go through JSON.
+    MetadataIntRange = (-2**63, 2**63 - 1)
+    MetadataDecoders = {'int': int, 'float': float, 'str': str}
+    MetadataJSONType = 'json'
 
     def __init__(self, name: str) -> None:
         """An unremarkably boring constructor.
@@ -44,8 +76,33 @@ class StackzillaSQLiteDB(StackzillaDBBase):
         """
         super().__init__(name=f'{name}.db')
 
-        # Locking mechanism for database access
-        self._lock: Lock = Lock()
+        # Locking mechanism for database access. Re-entrant so that a thread holding the lock for a
+        # transaction() block can still call the individual query methods.
+        self._lock: RLock = RLock()
+
+        # True while the lock holder is inside of a transaction() block, deferring all commits until it exits
+        self._in_tx: bool = False
+
+        # Thread ID of the transaction() block owner. That thread must read through the main connection in order
+        # to see its own uncommitted changes.
+        self._tx_owner: Optional[int] = None
+
+        # Per-thread read-only connections for on-disk databases. Queries which don't write are run on these so
+        # that readers aren't serialized behind the DB lock; WAL mode lets them run alongside the writer. Every
+        # reader is tracked so that they can all be closed along with the main connection. The generation is
+        # bumped on each connect so that threads drop readers which belong to a previous connection.
+        self._tls = local()
+        self._readers: List[Connection] = []
+        self._readers_lock: Lock = Lock()
+        self._generation: int = 0
+        self._in_memory: bool = False
+
+        # Cache of resource Python paths to their database row IDs. Entries are evicted when the resource is
+        # deleted, and the whole cache is dropped on rollback (the cached IDs may no longer exist).
+        self._resource_id_cache: Dict[str, int] = {}
+
+        # Cache of resource Python paths to the (module, class) that get_resource() resolved them to
+        self._class_cache: Dict[str, Tuple[ModuleType, Type[StackzillaResource]]] = {}
         self._db: Optional[Connection] = None
         self._cursor: Optional[Cursor] = None
         self._logger = CoreLogger(component='StackzillaSQLiteDB')
@@ -81,36 +138,130 @@ class StackzillaSQLiteDB(StackzillaDBBase):
             self._attr_cache_lock.release()
 
     @contextmanager
-    def execute(self, query: str, params: dict = None, commit: bool = True):
+    def execute(self, query: str, params: dict = None, commit: bool = True, named_columns: bool = True):
         """Context manager for executing a database query.
 
         Args:
             query (str): The SQL for the query
             params (dict, optional): Parameters to pass into the query. Defaults to None.
             commit (bool, optional): A boolean to indicate if a commit should be made after the query. Defaults to True.
+            named_columns (bool, optional): Return rows that can be indexed by column name. If False, plain tuples
+                                            are returned instead, which are cheaper to build. Defaults to True.
 
         Yields:
             _type_: An SQLite Cursor object
         """
-        self._lock.acquire()
+        # Read-only queries go to this thread's reader connection (if there is one) without taking the DB lock
+        reader = self._reader_connection() if commit is False else None
+        if reader is None:
+            self._lock.acquire()
 
         try:
+            cursor = (reader or self.connection).cursor()
+            if named_columns is False:
+                cursor.row_factory = None
+
             if params:
-                yield self.connection.execute(query, params)
+                yield cursor.execute(query, params)
             else:
-                yield self.connection.execute(query)
+                yield cursor.execute(query)
         # pylint: disable=try-except-raise
         except:
             raise
         else:
             # Only perform the commit if no execption was raised!
             if commit:
-                try:
-                    self.connection.commit()
-                except sqlite3.OperationalError as error:
-                    raise DatabaseCommitError(error) from error
+                self._commit()
         finally:
-            self._lock.release()
+            if reader is None:
+                self._lock.release()
+
+    def _reader_connection(self) -> Optional[Connection]:
+        """Fetch the read-only connection for the calling thread, opening it on first use.
+
+        Returns:
+            Optional[Connection]: The connection, or None if the query must be run on the main connection.
+        """
+        # Each connection to an in-memory database sees its own empty database, and the transaction owner has
+        # to see its own uncommitted writes. Both of those cases use the main connection.
+        if self._in_memory or self._db is None or self._tx_owner == get_ident():
+            return None
+
+        # A single-thread SQLite build has no internal mutexes at all, so it isn't safe to run connections in
+        # parallel. Everything goes through the (locked) main connection in that case.
+        if sqlite3.threadsafety == 0:
+            return None
+
+        reader = getattr(self._tls, 'reader', None)
+        if reader is None or self._tls.generation != self._generation:
+            reader = sqlite3.connect(self.name, check_same_thread=False, isolation_level=None,
+                                     cached_statements=STATEMENT_CACHE_SIZE)
+            reader.row_factory = sqlite3.Row
+            reader.execute('PRAGMA query_only = 1')
+
+            with self._readers_lock:
+                self._readers.append(reader)
+
+            self._tls.reader = reader
+            self._tls.generation = self._generation
+
+        return reader
+
+    @contextmanager
+    def transaction(self):
+        """Context manager which groups all database operations within the block into a single transaction.
+
+        The database lock is held for the duration of the block, and a single commit is made when it exits.
+        If an exception is raised within the block, all of the changes are rolled back. Nested
+        transaction() blocks are folded into the outermost one.
+
+        Raises:
+            DatabaseCommitError: Raised if the final commit fails.
+        """
+        with self.lock_db():
+            # Already within a transaction, let the outermost block handle the commit
+            if self._in_tx:
+                yield
+                return
+
+            if self.connection.in_transaction is False:
+                self.connection.execute('BEGIN')
+
+            self._in_tx = True
+            self._tx_owner = get_ident()
+            try:
+                yield
+            except:
+                self._rollback()
+                raise
+            else:
+                self._in_tx = False
+                self._commit()
+            finally:
+                self._in_tx = False
+                self._tx_owner = None
+
+    def _rollback(self) -> None:
+        """Roll back the pending changes and drop any cached state that may refer to them."""
+        self.connection.rollback()
+        self._resource_id_cache.clear()
+
+        with self.lock_attr_cache():
+            self._attribute_cache.clear()
+
+    def _commit(self) -> None:
+        """Commit the pending changes, unless a transaction() block is active. The caller must hold the DB lock.
+
+        Raises:
+            DatabaseCommitError: Raised if the commit fails.
+        """
+        if self._in_tx:
+            return
+
+        try:
+            self.connection.commit()
+        except sqlite3.OperationalError as error:
+            raise DatabaseCommitError(error) from error
 
     @property
     def connection(self) -> Connection:
@@ -129,55 +280,25 @@ class StackzillaSQLiteDB(StackzillaDBBase):
         Raises:
             DatabaseExists: Raised if the file already exists.
         """
+        self._in_memory = in_memory
         if in_memory:
-            self._db = sqlite3.connect('file::memory:?cache=shared', check_same_thread=False)
+            self._connect(database='file::memory:?cache=shared')
         else:
             # If the database already exists, raise an exception
             if os.path.exists(self.name):
                 raise DatabaseExists
 
-            self._db = sqlite3.connect(self.name, check_same_thread=False)
+            self._connect(database=self.name)
 
-        # Access query results by column ID instead of by index
-        self._db.row_factory = sqlite3.Row
-
-        self._cursor = self._db.cursor()
-
-        # Create the metadata store
-        self._db.execute(f'CREATE TABLE IF NOT EXISTS {StackzillaSQLiteDB.MetadataTableName} (key text unique, value text)')
-
-        # Create the StackzillaResource table
-        self._db.execute("""CREATE TABLE StackzillaResource(
-            id INTEGER PRIMARY KEY,
-            path TEXT UNIQUE,
-            version_major INTEGER,
-            version_minor INTEGER,
-            version_build INTEGER,
-            version_name TEXT)""")
-
-        # Create the StackzillaAttribute table
-        create_attribute_sql = """CREATE TABLE StackzillaAttribute(
-                                  "id" INTEGER PRIMARY KEY,
-                                  "name" TEXT,
-                                  "value" BLOB,
-                                  "resource_id" INTEGER,
-                                  FOREIGN KEY(resource_id) REFERENCES StackzillaResource(id) ON DELETE CASCADE)"""
-        self._db.execute(create_attribute_sql)
-
-        # Create the blueprint module table
-        create_blueprint_module_sql = """CREATE TABLE StackzillaBlueprintModule(
-                                         "ID" INTEGER PRIMARY KEY,
-                                         "path" TEXT UNIQUE,
-                                         "data" TEXT)"""
-        self._db.execute(create_blueprint_module_sql)
-
-        # Create the blueprint package table
-        create_blueprint_package_sql = """CREATE TABLE StackzillaBlueprintPackage(
-                                         "ID" INTEGER PRIMARY KEY,
-                                         "path" TEXT UNIQUE)"""
-        self._db.execute(create_blueprint_package_sql)
-
-        self._db.commit()
+        # Build the entire schema in one transaction so a failure can't leave a partially created database.
+        # executescript() commits any pending transaction before it starts, so the script manages its own.
+        with self.lock_db():
+            try:
+                self._db.executescript(SQL_CREATE_SCHEMA)
+            except sqlite3.Error:
+                if self._db.in_transaction:
+                    self._db.rollback()
+                raise
 
     def delete(self) -> None:
         """Delete the sqlite databse file."""
@@ -199,13 +320,74 @@ class StackzillaSQLiteDB(StackzillaDBBase):
         if os.path.exists(self.name) is False:
             raise DatabaseNotFound
 
-        self._db = sqlite3.connect(self.name, check_same_thread=False)
+        self._in_memory = False
+        self._connect(database=self.name)
+        self._migrate()
+
+    def _connect(self, database: str) -> None:
+        """Open the connection to the database and configure it.
+
+        Args:
+            database (str): The database file name, or an SQLite URI
+        """
+        self._configure(connection=sqlite3.connect(database, check_same_thread=False, isolation_level=None,
+                                                   cached_statements=STATEMENT_CACHE_SIZE))
+
+    def _configure(self, connection: Connection) -> None:
+        """Adopt an open connection as the main connection, and configure it.
 
-        # Access query results by column ID instead of by index
-        self._db.row_factory = sqlite3.Row
+        Args:
+            connection (Connection): The connection to use
+        """
+        self._db = connection
+        self._generation += 1
+
+        configure_connection(connection=self._db)
 
         self._cursor = self._db.cursor()
 
+    @classmethod
+    def from_connection(cls, name: str, connection: Connection) -> 'StackzillaSQLiteDB':
+        """Create a database object which uses an already open connection, such as a copy made with the backup API.
+
+        The connection must already contain the Stackzilla schema. It should be opened with check_same_thread=False
+        if the database will be used from multiple threads.
+
+        Args:
+            name (str): Full path to the database file. Name will be appended with ".db"
+            connection (Connection): The open connection to adopt
+
+        Returns:
+            StackzillaSQLiteDB: The database object, ready for use
+        """
+        database = cls(name=name)
+
+        # An in-memory database has an empty file name for the main schema
+        main_file = [row[2] for row in connection.execute('PRAGMA database_list') if row[1] == 'main'][0]
+        database._in_memory = not main_file
+
+        database._configure(connection=connection)
+        database._migrate()
+        return database
+
+    def _migrate(self) -> None:
+        """Bring a database created by an earlier version up to date with the current schema.
+
+        Metadata rows written prior to the type column have no type and are decoded as JSON, which is how they were
+        stored.
+        """
+        if migrate_metadata(connection=self._db):
+            self._logger.debug('Added the type column to the metadata table')
+
+        try:
+            if migrate_attribute_index(connection=self._db):
+                self._logger.debug('Added the attribute index')
+        except sqlite3.IntegrityError:
+            # Without the unique index, duplicate attributes could be written. There's no telling which of them is
+            # right, so index them without the constraint. That at least keeps the lookups from scanning the table.
+            self._logger.warning('Duplicate attributes found, the attribute index is not unique')
+            self._db.execute(SQL_CREATE_ATTRIBUTE_LOOKUP_INDEX)
+
     def close(self) -> None:
         """Close an existing connection.
 
@@ -222,9 +404,31 @@ class StackzillaSQLiteDB(StackzillaDBBase):
         if self._db is None:
             return
 
+        # Let SQLite refresh the query planner statistics for any tables that need it. This is cheap, and
+        # recommended by the SQLite documentation for every connection prior to closing.
+        try:
+            self.connection.execute('PRAGMA optimize')
+        except sqlite3.OperationalError as error:
+            self._logger.warning(f'PRAGMA optimize failed: {error}')
+
+        with self._readers_lock:
+            for reader in self._readers:
+                reader.close()
+            self._readers.clear()
+
         self.connection.close()
         self._db = None
         self._cursor = None
+        self._resource_id_cache.clear()
+
+        with self.lock_attr_cache():
+            self._attribute_cache.clear()
+
+    def vacuum(self) -> None:
+        """Rebuild the database file to reclaim unused space, then refresh the query planner statistics."""
+        with self.lock_db():
+            self.connection.execute('VACUUM')
+            self.connection.execute('ANALYZE')
 
     def get_metadata(self, key: str) -> Any:
         """Fetch metadata from the database.
@@ -238,16 +442,21 @@ class StackzillaSQLiteDB(StackzillaDBBase):
         Returns:
             Any: The value associated with the key.
         """
-        sql = f'SELECT value FROM {StackzillaSQLiteDB.MetadataTableName}  WHERE key = ?'
         item = None
-        with self.execute(query=sql, params=(key,)) as cursor:
+        with self.execute(query=SQL_GET_METADATA, params=(key,), commit=False, named_columns=False) as cursor:
             item = cursor.fetchone()
 
         if item is None:
             raise MetadataKeyNotFound
 
-        value = json.loads(item[0])
-        return value
+        value, value_type = item
+
+        # Natively stored values only need the (cheap) type conversion, in case the column coerced them
+        decoder = StackzillaSQLiteDB.MetadataDecoders.get(value_type)
+        if decoder:
+            return decoder(value)
+
+        return json.loads(value)
 
     def set_metadata(self, key: str, value: Any) -> None:
         """Set the value for the specified metdata key.
@@ -256,10 +465,21 @@ class StackzillaSQLiteDB(StackzillaDBBase):
             key (str): The unique key to set the value for.
             value (Any): The data to associate with the key.
         """
-        json_value = json.dumps(value)
+        # Scalars are stored natively, skipping the JSON encode/decode entirely
+        value_type = StackzillaSQLiteDB.MetadataNativeTypes.get(type(value))
+        if value_type == 'int':
+            int_min, int_max = StackzillaSQLiteDB.MetadataIntRange
+            if not int_min <= value <= int_max:
+                value_type = None
+        elif value_type == 'float' and not math.isfinite(value):
+            value_type = None
+
+        if value_type is None:
+            value_type = StackzillaSQLiteDB.MetadataJSONType
+            value = json.dumps(value)
+
         self._logger.debug(f'Setting metadata on {key = }')
-        query = f'REPLACE INTO {StackzillaSQLiteDB.MetadataTableName} (key, value) VALUES (?,?)'
-        with self.execute(query=query, params=(key, json_value)):
+        with self.execute(query=SQL_SET_METADATA, params=(key, value, value_type)):
             pass
 
     def delete_metadata(self, key: str) -> None:
@@ -271,12 +491,12 @@ class StackzillaSQLiteDB(StackzillaDBBase):
         Raises:
             MetadataKeyNotFound: Raised if the specified key does not exist.
         """
-        if self.check_metadata(key=key) is False:
-            raise MetadataKeyNotFound
+        # A single statement, rather than a check followed by a delete, keeps the operation atomic
+        with self.execute(query=SQL_DELETE_METADATA, params=(key,)) as cursor:
+            deleted = cursor.rowcount
 
-        query = f'DELETE FROM {StackzillaSQLiteDB.MetadataTableName}  WHERE key = ?'
-        with self.execute(query=query, params=(key,)):
-            pass
+        if deleted == 0:
+            raise MetadataKeyNotFound
 
     def check_metadata(self, key: str) -> bool:
         """Query if the specified metadata key exists.
@@ -287,9 +507,8 @@ class StackzillaSQLiteDB(StackzillaDBBase):
         Returns:
             bool: True if the key exists, False otherwise
         """
-        query = f'SELECT 1 FROM {StackzillaSQLiteDB.MetadataTableName} WHERE key = ?'
         exists = False
-        with self.execute(query=query, params=(key,)) as cursor:
+        with self.execute(query=SQL_CHECK_METADATA, params=(key,), commit=False, named_columns=False) as cursor:
             exists = cursor.fetchone() is not None
 
         return exists
@@ -303,56 +522,104 @@ class StackzillaSQLiteDB(StackzillaDBBase):
         Raises:
             CreateResourceFailure: Raised if a creation error occurs.
         """
-        resource_path = resource.path()
+        self.create_resources(resources=[resource])
+
+    def create_resources(self, resources: Iterable[StackzillaResource]) -> None:
+        """Create multiple StackzillaResource objects, and all of their attributes, in a single transaction.
+
+        Args:
+            resources (Iterable[StackzillaResource]): The resources to create.
+
+        Raises:
+            CreateResourceFailure: Raised if a creation error occurs. None of the resources are created.
+        """
+        create_sql = """INSERT INTO StackzillaResource
+        ("path", "version_major", "version_minor", "version_build", "version_name")
+        VALUES (:path, :version_major, :version_minor, :version_build, :version_name)"""
 
-        self._logger.debug(f'INSERT {resource_path}')
+        # Persist the resources and all of their attributes in a single transaction. If anything fails, the
+        # transaction is rolled back so that a half-created resource isn't left behind.
         try:
-            create_sql = """INSERT INTO StackzillaResource
-            ("path", "version_major", "version_minor", "version_build", "version_name")
-            VALUES (:path, :version_major, :version_minor, :version_build, :version_name)"""
-
-            version = resource.version()
-            create_params = {
-                'path': resource_path,
-                'version_major': version.major,
-                'version_minor': version.minor,
-                'version_build': version.build,
-                'version_name': version.name
-            }
-
-            # Do not unlock the database until the resource and all its attributes are created!
-            with self.lock_db():
-                cursor = self._cursor.execute(create_sql, create_params)
-                self.connection.commit()
-
-                resource_id = cursor.lastrowid
-                attr_create_sql = """INSERT INTO StackzillaAttribute ("resource_id",
-                                                                      "name",
-                                                                      "value")
-                                                                      VALUES (:resource_id, :name, :value)"""
-
-                # Crank through all of the attributes and persist them to the database
-                for name in resource.attributes:
-                    value = getattr(resource, name)
-                    insert_data = {
-                        'name': name,
-                        'value': self._value_encode(value),
-                        'resource_id': resource_id
+            with self.transaction():
+                attributes: List[Tuple[int, str, str, Any]] = []
+
+                for resource in resources:
+                    resource_path = resource.path()
+                    self._logger.debug(f'INSERT {resource_path}')
+
+                    version = resource.version()
+                    create_params = {
+                        'path': resource_path,
+                        'version_major': version.major,
+                        'version_minor': version.minor,
+                        'version_build': version.build,
+                        'version_name': version.name
                     }
 
-                    self._cursor.execute(attr_create_sql, insert_data)
+                    # The row ID is needed for the attributes, so each resource row is inserted on its own
+                    resource_id = self._cursor.execute(create_sql, create_params).lastrowid
+                    attributes.extend((resource_id, resource_path, name, getattr(resource, name))
+                                      for name in resource.attribute_names())
 
+                    # The insert already produced the row ID, no need to look it up again later
+                    self._resource_id_cache[resource_path] = resource_id
 
-                    # Don't forget to update the attribute cache!
-                    with self.lock_attr_cache():
-                        self._attribute_cache[f'{resource_path}.{name}'] = value
-
-                # Do a single commit for all of the attributes that were just added.
-                self.connection.commit()
+                # All of the attributes, for every resource, go in with as few statements as possible
+                self._insert_attributes(attributes=attributes)
 
         except sqlite3.IntegrityError as exc:
             raise CreateResourceFailure() from exc
 
+    def create_attributes(self, resource: StackzillaResource, items: Iterable[Tuple[str, Any]]) -> None:
+        """Create multiple attributes for an existing resource in a single transaction.
+
+        Args:
+            resource (StackzillaResource): The resource that the attributes belong to
+            items (Iterable[Tuple[str, Any]]): (name, value) pairs for each attribute to create
+
+        Raises:
+            ResourceNotFound: Raised if the resource is not in the database
+            DuplicateAttribute: Raised if any of the attributes already exist. No attributes are created.
+            CreateAttributeFailure: Raised if the database insertion fails. No attributes are created.
+        """
+        resource_path = resource.path()
+        resource_id = self._resource_id_from_path(path=resource_path)
+        attributes = [(resource_id, resource_path, name, value) for name, value in items]
+
+        try:
+            with self.transaction():
+                self._insert_attributes(attributes=attributes)
+        except sqlite3.IntegrityError as exc:
+            if self._is_unique_violation(exc):
+                raise DuplicateAttribute(resource_path) from exc
+
+            raise CreateAttributeFailure(resource_path) from exc
+
+    def _insert_attributes(self, attributes: List[Tuple[int, str, str, Any]]) -> None:
+        """Insert attribute rows using multi-row INSERT statements. The caller must be within a transaction() block.
+
+        Args:
+            attributes (List[Tuple[int, str, str, Any]]): (resource ID, resource path, name, value) for each attribute.
+                                                          The resource path is used for the attribute cache keys.
+        """
+        rows = [(resource_id, name, self._value_encode(value)) for resource_id, _, name, value in attributes]
+
+        for start in range(0, len(rows), ATTRIBUTE_INSERT_ROWS):
+            chunk = rows[start:start + ATTRIBUTE_INSERT_ROWS]
+
+            # Full chunks all share one (cached) statement, only a trailing partial chunk needs its own
+            if len(chunk) == ATTRIBUTE_INSERT_ROWS:
+                sql = SQL_INSERT_ATTRIBUTES_FULL
+            else:
+                sql = SQL_INSERT_ATTRIBUTES + ', '.join(['(?, ?, ?)'] * len(chunk))
+
+            self._cursor.execute(sql, [param for row in chunk for param in row])
+
+        # Don't forget to update the attribute cache!
+        with self.lock_attr_cache():
+            for _, resource_path, name, value in attributes:
+                self._attribute_cache[f'{resource_path}.{name}'] = value
+
     def delete_resource(self, path: str) -> None:
         """Delete the specified resource from the database.
 
@@ -362,10 +629,20 @@ class StackzillaSQLiteDB(StackzillaDBBase):
         Raises:
             ResourceNotFound: Raised if the resource specified by path does not exist in the database.
         """
-        resource_id: int = self._resource_id_from_path(path=path)
+        # The lookup and the delete are performed atomically. The delete cascades to all of the resource's attributes.
+        with self.transaction():
+            resource_id: int = self._resource_id_from_path(path=path)
 
-        with self.execute(query='DELETE FROM StackzillaResource WHERE id=:resource_id', params={'resource_id': resource_id}):
-            pass
+            with self.execute(query='DELETE FROM StackzillaResource WHERE id=:resource_id', params={'resource_id': resource_id}):
+                pass
+
+            self._resource_id_cache.pop(path, None)
+
+            # Drop any cached values for the attributes removed by the cascade
+            attr_prefix = f'{path}.'
+            with self.lock_attr_cache():
+                for key in [key for key in self._attribute_cache if key.startswith(attr_prefix)]:
+                    del self._attribute_cache[key]
 
     def get_all_resources(self) -> List[StackzillaResource]:
         """Fetch all of the resources available in the databae.
@@ -373,21 +650,49 @@ class StackzillaSQLiteDB(StackzillaDBBase):
         Returns:
             List[StackzillaResource]: A list of StackzillaResource objects
         """
-        results: List[StackzillaResource] = []
+        # Pass 1: Warm the caches for every resource, and all of its attributes, with a single query
+        resource_paths = self._load_resource_caches()
 
-        # The call to get_resource path can not be made inside of the fetchall() loop because it will
-        # cause a double lock (get_resource() calls execute() as well)
-        # Pass 1: Build a list of all the resource paths
-        resource_paths = []
-        with self.execute(query='SELECT * FROM StackzillaResource') as cursor:
-            for result in cursor.fetchall():
-                resource_paths.append(result['path'])
+        # Pass 2: Build a StackzillaResource object for each path. The attributes all come out of the cache.
+        # The objects are not built while iterating the cursor so that the database lock
+        # isn't held while each resource is loaded.
+        return [self._build_resource(path=path) for path in resource_paths]
 
-        # Pass 2: Fetch a StackzillaResource object WITH its parameters field populated
-        for path in resource_paths:
-            results.append(self.get_resource(path=path))
+    def _load_resource_caches(self, path: Optional[str] = None) -> List[str]:
+        """Load the resource ID and attribute caches with a single query, rather than one query per attribute.
 
-        return results
+        Args:
+            path (Optional[str]): Only load the resource with this path. Defaults to None, which loads every resource.
+
+        Returns:
+            List[str]: The paths of the loaded resources, in the order they were created
+        """
+        query = """SELECT r.id, r.path, a.name, a.value FROM StackzillaResource AS r
+                   LEFT JOIN StackzillaAttribute AS a ON a.resource_id = r.id"""
+        if path is None:
+            query += ' ORDER BY r.id'
+            params = None
+        else:
+            query += ' WHERE r.path = :path'
+            params = {'path': path}
+
+        # The lock is held so that a concurrent delete can't leave stale cache entries behind
+        with self.lock_db():
+            with self.execute(query=query, params=params, commit=False, named_columns=False) as cursor:
+                rows = cursor.fetchall()
+
+            # Resources without any attributes have a single row of NULLs from the join
+            resource_ids = {path: resource_id for resource_id, path, _, _ in rows}
+            attributes = {f'{path}.{name}': self._value_decode(value)
+                          for _, path, name, value in rows if name is not None}
+
+            self._resource_id_cache.update(resource_ids)
+
+            # Everything is decoded up front, the attribute cache lock is only held for a single update
+            with self.lock_attr_cache():
+                self._attribute_cache.update(attributes)
+
+        return list(resource_ids)
 
     def get_resource(self, path: str) -> StackzillaResource:
         """Fetch a resource from the database.
@@ -401,19 +706,37 @@ class StackzillaSQLiteDB(StackzillaDBBase):
         Raises:
             ResourceNotFound: If the specified path does not exist
         """
-        # Verify that the resource is availbale (ResourceNotFound will be raised if it isn't)
-        self._resource_from_path(path=path)
+        # Load the resource and all of its attributes with one query. This also verifies that it exists.
+        # A path of None would load every resource, so it is rejected up front.
+        if path is None or not self._load_resource_caches(path=path):
+            raise ResourceNotFound(path)
+
+        return self._build_resource(path=path)
 
+    def _build_resource(self, path: str) -> StackzillaResource:
+        """Instantiate a resource whose attributes have already been loaded into the attribute cache.
+
+        Args:
+            path (str): The full python path to the resource within the blueprint
+
+        Returns:
+            StackzillaResource: An instance of the derrived StackzillaResource class
+        """
         # Break apart the path into the module and class components
         # example "a.b.c.MyClass" where "a.b.c" is the module and "MyClass" is the class naame
-        class_name = path.split('.')[-1]
-        module_name = '.'.join(path.split('.')[:-1])
+        module_name, _, class_name = path.rpartition('.')
 
-        # It is assumed that the blueprint has ALREADY been imported and that this module can be loaded
-        module = importlib.import_module(module_name)
-        class_ = getattr(module, class_name)
+        # Use the cached class, as long as its module hasn't been reloaded or replaced since it was cached
+        cached = self._class_cache.get(path)
+        if cached and sys.modules.get(module_name) is cached[0]:
+            class_ = cached[1]
+        else:
+            # It is assumed that the blueprint has ALREADY been imported and that this module can be loaded
+            module = importlib.import_module(module_name)
+            class_ = getattr(module, class_name)
+            self._class_cache[path] = (module, class_)
 
-        # Load all of the attribute values from the database
+        # Load all of the attribute values (from the cache) and the version from the database
         obj = class_.from_db()
         return obj
 
@@ -536,17 +859,17 @@ class StackzillaSQLiteDB(StackzillaDBBase):
 
         resource_id = self._resource_id_from_path(path=resource_path)
 
-        select_sql = 'SELECT * FROM StackzillaAttribute WHERE resource_id=:resource_id AND name=:name'
+        select_sql = 'SELECT value FROM StackzillaAttribute WHERE resource_id=:resource_id AND name=:name'
         select_args = {'resource_id': resource_id, 'name': name}
 
         row = None
-        with self.execute(query=select_sql, params=select_args, commit=False) as cursor:
+        with self.execute(query=select_sql, params=select_args, commit=False, named_columns=False) as cursor:
             row = cursor.fetchone()
 
         if row is None:
             raise AttributeNotFound(f'{name=} | {resource_id=}')
 
-        data = self._value_decode(row['value'])
+        data = self._value_decode(row[0])
 
         # Save the result in the attribute cache
         self._write_attribute_cache(key=f'{resource_path}.{name}', value=data)
@@ -565,14 +888,9 @@ class StackzillaSQLiteDB(StackzillaDBBase):
             data (str): Contents of the module file. If not specified, the module is actually a package. Defaults to None.
 
         Raises:
+            DuplicateBlueprintModule: Raised if a module with the same path already exists.
             CreateBlueprintModuleFailure: Raised when the database insertion fails.
         """
-        try:
-            self._get_blueprint_module_id(path=path)
-            raise DuplicateBlueprintModule
-        except BlueprintModuleNotFound:
-            pass
-
         sql = """INSERT INTO StackzillaBlueprintModule ("path", "data") VALUES (:path, :data)"""
         insert_data = {
             'path': path,
@@ -583,6 +901,10 @@ class StackzillaSQLiteDB(StackzillaDBBase):
             with self.execute(query=sql, params=insert_data):
                 pass
         except sqlite3.IntegrityError as exc:
+            # The UNIQUE constraint on path is what detects duplicates, no need for a lookup beforehand
+            if self._is_unique_violation(exc):
+                raise DuplicateBlueprintModule(path) from exc
+
             raise CreateBlueprintModuleFailure() from exc
 
     def get_blueprint_module(self, path: str) -> str:
@@ -597,15 +919,15 @@ class StackzillaSQLiteDB(StackzillaDBBase):
         Raises:
             BlueprintModuleNotFound: Raised when the path does not exist.
         """
-        select_sql = 'SELECT * FROM StackzillaBlueprintModule WHERE path=:path'
+        select_sql = 'SELECT data FROM StackzillaBlueprintModule WHERE path=:path'
         row = None
-        with self.execute(query=select_sql, params={'path': path}) as cursor:
+        with self.execute(query=select_sql, params={'path': path}, commit=False, named_columns=False) as cursor:
             row = cursor.fetchone()
 
         if row is None:
             raise BlueprintModuleNotFound
 
-        return row['data']
+        return row[0]
 
     def get_blueprint_modules(self) -> List[str]:
         """Query all of the available modules.
@@ -613,13 +935,9 @@ class StackzillaSQLiteDB(StackzillaDBBase):
         Returns:
             List[str]: A list of Python paths, each represenging a module
         """
-        results: List[str] = []
-        select_sql = 'SELECT * FROM StackzillaBlueprintModule'
-        with self.execute(query=select_sql) as cursor:
-            for row in cursor.fetchall():
-                results.append(row['path'])
-
-        return results
+        select_sql = 'SELECT path FROM StackzillaBlueprintModule'
+        with self.execute(query=select_sql, commit=False, named_columns=False) as cursor:
+            return [row[0] for row in cursor]
 
 
     def update_blueprint_module(self, path: str, data: str) -> None:
@@ -655,14 +973,17 @@ class StackzillaSQLiteDB(StackzillaDBBase):
         Raises:
             BlueprintModuleNotFound: Raised when the path does not exist.
         """
-        blueprint_module_id = self._get_blueprint_module_id(path=path)
-        delete_sql = 'DELETE FROM StackzillaBlueprintModule WHERE id=:id'
+        # A single statement, rather than an ID lookup followed by a delete, keeps the operation atomic
+        delete_sql = 'DELETE FROM StackzillaBlueprintModule WHERE path=:path'
+        with self.execute(query=delete_sql, params={'path': path}) as cursor:
+            deleted = cursor.rowcount
 
-        with self.execute(query=delete_sql, params={'id': blueprint_module_id}):
-            pass
+        if deleted == 0:
+            raise BlueprintModuleNotFound
 
     def delete_all_blueprint_modules(self) -> None:
         """Delete all of the blueprints from the database."""
+        # No WHERE clause, so SQLite can use its truncate optimization rather than deleting row by row
         delete_sql = 'DELETE FROM StackzillaBlueprintModule'
         with self.execute(query=delete_sql):
             pass
@@ -672,13 +993,11 @@ class StackzillaSQLiteDB(StackzillaDBBase):
 
         Args:
             path (str): Full Python path of the package
-        """
-        try:
-            self._get_blueprint_package_id(path=path)
-            raise DuplicateBlueprintPackage
-        except BlueprintPackageNotFound:
-            pass
 
+        Raises:
+            DuplicateBlueprintPackage: Raised if a package with the same path already exists.
+            CreateBlueprintPackageFaiure: Raised when the database insertion fails.
+        """
         sql = """INSERT INTO StackzillaBlueprintPackage ("path") VALUES (:path)"""
         insert_data = {
             'path': path,
@@ -688,6 +1007,9 @@ class StackzillaSQLiteDB(StackzillaDBBase):
             with self.execute(query=sql, params=insert_data):
                 pass
         except sqlite3.IntegrityError as exc:
+            if self._is_unique_violation(exc):
+                raise DuplicateBlueprintPackage(path) from exc
+
             raise CreateBlueprintPackageFaiure() from exc
 
     def delete_blueprint_package(self, path: str) -> None:
@@ -695,14 +1017,21 @@ class StackzillaSQLiteDB(StackzillaDBBase):
 
         Args:
             path (str): Full Python path to the package
+
+        Raises:
+            BlueprintPackageNotFound: Raised when the path does not exist.
         """
-        blueprint_package_id = self._get_blueprint_package_id(path=path)
-        delete_sql = 'DELETE FROM StackzillaBlueprintPackage WHERE id=:id'
-        with self.execute(query=delete_sql, params={'id': blueprint_package_id}):
-            pass
+        # A single statement, rather than an ID lookup followed by a delete, keeps the operation atomic
+        delete_sql = 'DELETE FROM StackzillaBlueprintPackage WHERE path=:path'
+        with self.execute(query=delete_sql, params={'path': path}) as cursor:
+            deleted = cursor.rowcount
+
+        if deleted == 0:
+            raise BlueprintPackageNotFound
 
     def delete_all_blueprint_packages(self) -> None:
         """Delete all of the blueprint packages from the database."""
+        # No WHERE clause, so SQLite can use its truncate optimization rather than deleting row by row
         delete_sql = 'DELETE FROM StackzillaBlueprintPackage'
         with self.execute(query=delete_sql):
             pass
@@ -711,16 +1040,18 @@ class StackzillaSQLiteDB(StackzillaDBBase):
         """Queries if a blueprint package exists in the database.
 
         Args:
-            path (str): _description_
+            path (str): Full Python path to the package
 
         Returns:
-            bool: _description_
+            bool: True if the package exists, False otherwise
         """
-        try:
-            self._get_blueprint_package_id(path=path)
-            return True
-        except BlueprintPackageNotFound:
-            return False
+        # Only existence matters, so the lookup is answered entirely from the unique index on path
+        exists = False
+        select_sql = 'SELECT 1 FROM StackzillaBlueprintPackage WHERE path=:path'
+        with self.execute(query=select_sql, params={'path': path}, commit=False, named_columns=False) as cursor:
+            exists = cursor.fetchone() is not None
+
+        return exists
 
     def get_blueprint_packages(self) -> List[str]:
         """Fetch a list of all the blueprint packages.
@@ -728,46 +1059,28 @@ class StackzillaSQLiteDB(StackzillaDBBase):
         Returns:
             List[str]: A list of blueprint package names.
         """
-        results: List[str] = []
-        select_sql = 'SELECT * FROM StackzillaBlueprintPackage'
-        with self.execute(query=select_sql, commit=False) as cursor:
+        select_sql = 'SELECT path FROM StackzillaBlueprintPackage'
+        with self.execute(query=select_sql, commit=False, named_columns=False) as cursor:
+            return [row[0] for row in cursor]
 
-            for row in cursor.fetchall():
-                results.append(row['path'])
+    @staticmethod
+    def _is_unique_violation(error: sqlite3.IntegrityError) -> bool:
+        """Test if an IntegrityError was caused by a UNIQUE constraint (as opposed to NOT NULL, FOREIGN KEY, etc)."""
+        return 'UNIQUE' in str(error)
 
-        return results
+    def _value_encode(self, value: Any) -> bytes:
+        """Pickle a value, to be stored as a BLOB."""
+        return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
 
-    def _value_encode(self, value: Any) -> str:
-        """Pickle and base64 encode a value."""
-        pickled_val = pickle.dumps(value)
-        return base64.encodebytes(pickled_val).decode('ascii')
+    def _value_decode(self, value: Union[bytes, str]) -> Any:
+        """Unpickle a value.
 
-    def _value_decode(self, value: str) -> Any:
-        """base64 decode and unpickle the value."""
-        decoded_val = base64.decodebytes(value.encode("ascii"))
-        return pickle.loads(decoded_val)
-
-    def _get_blueprint_package_id(self, path: str) -> int:
-        """Fetch the row ID for a given blueprint package, based on the provided path.
-
-        Args:
-            path (str): Full Python path to the blueprint package
-
-        Raises:
-            BlueprintPackageNotFound: Raised if the module is not found
-
-        Returns:
-            int: The row ID for the module
+        Values written by older versions were base64 encoded and stored as TEXT. Those are decoded first.
         """
-        select_sql = 'SELECT * FROM StackzillaBlueprintPackage WHERE path=:path'
-        row = None
-        with self.execute(query=select_sql, params={'path': path}) as cursor:
-            row = cursor.fetchone()
+        if isinstance(value, str):
+            value = base64.decodebytes(value.encode('ascii'))
 
-        if row is None:
-            raise BlueprintPackageNotFound
-
-        return row['id']
+        return pickle.loads(value)
 
     def _get_blueprint_module_id(self, path: str) -> int:
         """Fetch the row ID for a given blueprint module, based on the provided path.
@@ -781,15 +1094,15 @@ class StackzillaSQLiteDB(StackzillaDBBase):
         Returns:
             int: The row ID for the module
         """
-        select_sql = 'SELECT * FROM StackzillaBlueprintModule WHERE path=:path'
+        select_sql = 'SELECT id FROM StackzillaBlueprintModule WHERE path=:path'
         row = None
-        with self.execute(query=select_sql, params={'path': path}, commit=False) as cursor:
+        with self.execute(query=select_sql, params={'path': path}, commit=False, named_columns=False) as cursor:
             row = cursor.fetchone()
 
         if row is None:
             raise BlueprintModuleNotFound
 
-        return row['id']
+        return row[0]
 
     def _get_attribute_id(self, resource: StackzillaResource, name: str) -> int:
         """Fetch the database ID for the requested attribute.
@@ -806,17 +1119,17 @@ class StackzillaSQLiteDB(StackzillaDBBase):
         """
         resource_id = self._resource_id_from_path(path=resource.path())
 
-        select_sql = 'SELECT * FROM StackzillaAttribute WHERE resource_id=:resource_id AND name=:name'
+        select_sql = 'SELECT id FROM StackzillaAttribute WHERE resource_id=:resource_id AND name=:name'
         select_args = {'resource_id': resource_id, 'name': name}
         row = None
 
-        with self.execute(query=select_sql, params=select_args, commit=False) as cursor:
+        with self.execute(query=select_sql, params=select_args, commit=False, named_columns=False) as cursor:
             row = cursor.fetchone()
 
         if row is None:
             raise AttributeNotFound(f'{name=} | {resource_id=}')
 
-        return row['id']
+        return row[0]
 
     def _resource_id_from_path(self, path: str) -> int:
         """Helper method to fetch the ID of the resource by its Python path.
@@ -830,15 +1143,24 @@ class StackzillaSQLiteDB(StackzillaDBBase):
         Returns:
             int: The SQLite ID of the row for the resource
         """
-        query = 'SELECT * FROM StackzillaResource WHERE path=:path'
-        row = None
-        with self.execute(query=query, params={'path': path}, commit=False) as cursor:
-            row = cursor.fetchone()
+        # Hold the lock across the lookup and the cache write so a concurrent delete can't leave a stale entry
+        with self.lock_db():
+            resource_id = self._resource_id_cache.get(path)
+            if resource_id is not None:
+                return resource_id
 
-        if row is None:
-            raise ResourceNotFound(path)
+            query = 'SELECT id FROM StackzillaResource WHERE path=:path'
+            row = None
+            with self.execute(query=query, params={'path': path}, commit=False, named_columns=False) as cursor:
+                row = cursor.fetchone()
+
+            if row is None:
+                raise ResourceNotFound(path)
+
+            resource_id = row[0]
+            self._resource_id_cache[path] = resource_id
 
-        return row['id']
+        return resource_id
 
     def _resource_from_path(self, path: str) -> dict:
         """Helper method to fetch an entire resource row from a given path.
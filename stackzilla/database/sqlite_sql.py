@@ -0,0 +1,134 @@
+"""SQL statements and connection setup for the SQLite database provider."""
+import sqlite3
+from sqlite3 import Connection
+
+# SQL for the metadata store. Built once at import time rather than formatted on every call.
+METADATA_TABLE_NAME = 'metadata'
+SQL_CREATE_METADATA = f'CREATE TABLE IF NOT EXISTS {METADATA_TABLE_NAME} (key text unique, value, type text)'
+SQL_METADATA_COLUMNS = f'PRAGMA table_info({METADATA_TABLE_NAME})'
+SQL_ADD_METADATA_TYPE = f'ALTER TABLE {METADATA_TABLE_NAME} ADD COLUMN type text'
+SQL_GET_METADATA = f'SELECT value, type FROM {METADATA_TABLE_NAME} WHERE key = ?'
+SQL_SET_METADATA = f'REPLACE INTO {METADATA_TABLE_NAME} (key, value, type) VALUES (?,?,?)'
+SQL_DELETE_METADATA = f'DELETE FROM {METADATA_TABLE_NAME} WHERE key = ?'
+SQL_CHECK_METADATA = f'SELECT 1 FROM {METADATA_TABLE_NAME} WHERE key = ?'
+
+# The (resource, name) index on the attributes, which databases created before it existed get when they're opened
+ATTRIBUTE_INDEX_NAME = 'idx_attr_resource_name'
+SQL_CREATE_ATTRIBUTE_INDEX = \
+    f'CREATE UNIQUE INDEX IF NOT EXISTS {ATTRIBUTE_INDEX_NAME} ON StackzillaAttribute(resource_id, name)'
+SQL_CREATE_ATTRIBUTE_LOOKUP_INDEX = \
+    f'CREATE INDEX IF NOT EXISTS {ATTRIBUTE_INDEX_NAME} ON StackzillaAttribute(resource_id, name)'
+SQL_FIND_ATTRIBUTE_INDEX = \
+    f"SELECT name FROM sqlite_master WHERE name IN ('StackzillaAttribute', '{ATTRIBUTE_INDEX_NAME}')"
+
+# The entire schema, run as a single script when a database is created
+SQL_CREATE_SCHEMA = f"""
+BEGIN;
+
+-- The metadata value column has no declared type so that SQLite stores native values without converting them
+{SQL_CREATE_METADATA};
+
+CREATE TABLE StackzillaResource(
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE,
+    version_major INTEGER,
+    version_minor INTEGER,
+    version_build INTEGER,
+    version_name TEXT);
+
+CREATE TABLE StackzillaAttribute(
+    "id" INTEGER PRIMARY KEY,
+    "name" TEXT,
+    "value" BLOB,
+    "resource_id" INTEGER,
+    FOREIGN KEY(resource_id) REFERENCES StackzillaResource(id) ON DELETE CASCADE);
+
+-- Attributes are always looked up by their owning resource and name. Index the pair so those lookups
+-- are a B-tree probe instead of a full table scan, and so that duplicate attributes are rejected.
+{SQL_CREATE_ATTRIBUTE_INDEX};
+
+CREATE TABLE StackzillaBlueprintModule(
+    "ID" INTEGER PRIMARY KEY,
+    "path" TEXT UNIQUE,
+    "data" TEXT);
+
+CREATE TABLE StackzillaBlueprintPackage(
+    "ID" INTEGER PRIMARY KEY,
+    "path" TEXT UNIQUE);
+
+COMMIT;
+"""
+
+# Size of each connection's prepared statement cache, which is keyed by the SQL text. Every query in the SQLite
+# provider uses constant SQL, so the cache only needs to be big enough to hold all of them without evictions.
+STATEMENT_CACHE_SIZE = 256
+
+# Attributes are inserted several rows per statement. With three parameters per row this stays well below
+# SQLite's historical limit of 999 bound parameters per statement.
+ATTRIBUTE_INSERT_ROWS = 300
+SQL_INSERT_ATTRIBUTES = 'INSERT INTO StackzillaAttribute ("resource_id", "name", "value") VALUES '
+SQL_INSERT_ATTRIBUTES_FULL = SQL_INSERT_ATTRIBUTES + ', '.join(['(?, ?, ?)'] * ATTRIBUTE_INSERT_ROWS)
+
+
+def configure_connection(connection: Connection) -> None:
+    """Apply the settings that every main database connection uses.
+
+    Args:
+        connection (Connection): The connection to configure
+    """
+    # Statements are grouped into transactions explicitly, see StackzillaSQLiteDB.transaction()
+    connection.isolation_level = None
+
+    # Access query results by column ID instead of by index
+    connection.row_factory = sqlite3.Row
+
+    # SQLite ignores foreign keys unless asked, which would leave attributes behind when a resource is deleted
+    connection.execute('PRAGMA foreign_keys = ON')
+
+    # Write-ahead logging lets readers carry on while a write is in progress, and only needs an fsync at
+    # checkpoint time when paired with synchronous=NORMAL. In-memory databases ignore the journal mode.
+    connection.execute('PRAGMA journal_mode = WAL')
+    connection.execute('PRAGMA synchronous = NORMAL')
+
+    # Keep temporary tables and indices off of the disk, and allow for a ~20MB page cache
+    connection.execute('PRAGMA temp_store = MEMORY')
+    connection.execute('PRAGMA cache_size = -20000')
+
+def migrate_metadata(connection: Connection) -> bool:
+    """Add the metadata type column to databases created before it existed.
+
+    Rows written prior to the migration have no type and are decoded as JSON, which is how they were stored.
+
+    Args:
+        connection (Connection): Connection to the database to migrate
+
+    Returns:
+        bool: True if the database was migrated, False if it was already up to date
+    """
+    columns = [row[1] for row in connection.execute(SQL_METADATA_COLUMNS)]
+    if 'type' in columns:
+        return False
+
+    connection.execute(SQL_ADD_METADATA_TYPE)
+    connection.commit()
+    return True
+
+
+def migrate_attribute_index(connection: Connection) -> bool:
+    """Add the attribute index to databases created before it existed.
+
+    Args:
+        connection (Connection): Connection to the database to migrate
+
+    Raises:
+        sqlite3.IntegrityError: Raised if the database already holds duplicate attributes
+
+    Returns:
+        bool: True if the index was added, False if it was already present (or there is no attribute table)
+    """
+    found = {row[0] for row in connection.execute(SQL_FIND_ATTRIBUTE_INDEX)}
+    if 'StackzillaAttribute' not in found or ATTRIBUTE_INDEX_NAME in found:
+        return False
+
+    connection.execute(SQL_CREATE_ATTRIBUTE_INDEX)
+    return True
@@ -1,12 +1,43 @@
 """Pytest configuration file for the database tests."""
+import sqlite3
+
 import pytest
 
 from stackzilla.database.sqlite import StackzillaSQLiteDB
 
 
+@pytest.fixture(name='database_template', scope='session')
+def fixture_database_template():
+    """Build the database schema once, and keep a private in-memory copy of it for each test to clone."""
+    builder = StackzillaSQLiteDB(name='template')
+    builder.create(in_memory=True)
+
+    template = sqlite3.connect(':memory:')
+    builder.connection.backup(template)
+
+    # Release the shared in-memory database so that nothing else sees the template schema
+    builder.close()
+    yield template
+
+    template.close()
+
 @pytest.fixture
-def database():
+def database(database_template):
     """Fixture that returns an in-memory database."""
-    memory_db = StackzillaSQLiteDB(name='test')
-    memory_db.create(in_memory=True)
-    return memory_db
+    # Copying the template pages is much cheaper than running all of the schema DDL again
+    connection = sqlite3.connect(':memory:', check_same_thread=False)
+    database_template.backup(connection)
+
+    memory_db = StackzillaSQLiteDB.from_connection(name='test', connection=connection)
+    yield memory_db
+
+    memory_db.close()
+
+@pytest.fixture
+def file_database(tmp_path):
+    """Fixture that returns an on-disk database."""
+    disk_db = StackzillaSQLiteDB(name=str(tmp_path / 'test'))
+    disk_db.create()
+    yield disk_db
+
+    disk_db.close()
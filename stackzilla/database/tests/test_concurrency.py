@@ -1,7 +1,8 @@
 """Verify that multi-threaded database access works."""
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from time import sleep
-from typing import List
+from threading import Event
+from typing import Dict, List, Type
+from unittest.mock import patch
 from uuid import UUID, uuid4
 
 from stackzilla.attribute import StackzillaAttribute
@@ -9,6 +10,21 @@ from stackzilla.database.sqlite import StackzillaSQLiteDB
 from stackzilla.resource import ResourceVersion, StackzillaResource
 
 resources = []
+
+# Set by db_write_worker once it starts writing, so the readers know there is something to race against
+_writing = Event()
+
+# Resource classes created on the fly by db_write_worker, keyed by class name. get_resource() looks classes up as
+# module attributes, which the module level __getattr__() below resolves from here.
+_DYN_CLASSES: Dict[str, Type['Resource']] = {}
+
+def __getattr__(name: str):
+    """Resolve the dynamically created resource classes (PEP 562)."""
+    try:
+        return _DYN_CLASSES[name]
+    except KeyError:
+        raise AttributeError(name) from None
+
 class Resource(StackzillaResource):
     """Demo resource."""
     uuid: UUID = StackzillaAttribute(required=True)
@@ -22,24 +38,25 @@ class Resource(StackzillaResource):
         return ResourceVersion(major=1, minor=0, build=0, name='FCS')
 
 def db_write_worker(database: StackzillaSQLiteDB, range: List[int]):
-    """Dynamically create resource classes and add them to the database."""
+    """Dynamically create resource classes and add them to the database in a single batch."""
+    batch = []
     for index in range:
-        new_class = type(f'MyResource{index}', (Resource,), {})
-        globals()[f'MyResource{index}'] = new_class
+        new_class = type(f'MyResource{index}', (Resource,), {'__module__': __name__})
+        _DYN_CLASSES[new_class.__name__] = new_class
         my_resource = new_class()
         my_resource.uuid = uuid4()
         resources.append(my_resource)
-        database.create_resource(resource=my_resource)
+        batch.append(my_resource)
 
-        # Give the other threads a chance to play
-        sleep(0.01)
+    _writing.set()
+    database.create_resources(resources=batch)
 
 
 def db_read_worker(database: StackzillaSQLiteDB, cycles: int):
     """Helper function which read all resources from the database."""
+    # Start reading as soon as the writes begin, rather than pacing each cycle with a sleep
+    _writing.wait(timeout=5)
     for _ in range(cycles):
-        # Give the other threads a chance to play
-        sleep(0.01)
         database.get_all_resources()
 
 def test_multiple_writes(database: StackzillaSQLiteDB):
@@ -64,6 +81,7 @@ def test_multiple_writes(database: StackzillaSQLiteDB):
 
 def test_multi_read_write(database: StackzillaSQLiteDB):
     """Verify that reading and writing to the database at the same time works."""
+    _writing.clear()
     futures = []
     with ThreadPoolExecutor(max_workers=16) as executor:
         # Create a bunch of resources
@@ -76,3 +94,38 @@ def test_multi_read_write(database: StackzillaSQLiteDB):
     for result in as_completed(futures):
         assert result.exception() is None
         assert result.result() is None
+
+def test_multi_read_write_file(file_database: StackzillaSQLiteDB):
+    """Verify that reading and writing to an on-disk database at the same time works."""
+    _writing.clear()
+    futures = []
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        futures.append(executor.submit(db_write_worker, database=file_database, range=range(50, 100, 1)))
+        futures.append(executor.submit(db_read_worker, database=file_database, cycles=50))
+        futures.append(executor.submit(db_read_worker, database=file_database, cycles=50))
+
+    for result in as_completed(futures):
+        assert result.exception() is None
+        assert result.result() is None
+
+    assert len(file_database.get_all_resources()) == 50
+
+def test_read_during_transaction(file_database: StackzillaSQLiteDB):
+    """Readers on other threads aren't blocked by a transaction, and only see what has been committed."""
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        with file_database.transaction():
+            file_database.set_metadata(key='foo', value='bar')
+
+            # The transaction owner sees its own change, other threads don't until it is committed
+            assert file_database.check_metadata(key='foo') is True
+            assert executor.submit(file_database.check_metadata, key='foo').result(timeout=5) is False
+
+        assert executor.submit(file_database.check_metadata, key='foo').result(timeout=5) is True
+
+def test_single_thread_sqlite(file_database: StackzillaSQLiteDB):
+    """Without a thread safe SQLite build, all queries must go through the main connection."""
+    with patch('sqlite3.threadsafety', 0):
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            assert executor.submit(file_database.check_metadata, key='foo').result(timeout=5) is False
+
+    assert not file_database._readers  # pylint: disable=protected-access
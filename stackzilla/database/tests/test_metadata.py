@@ -1,4 +1,8 @@
 """Testing for the SQLite database implementation."""
+import json
+import math
+import sqlite3
+
 import pytest
 
 from stackzilla.database.exceptions import MetadataKeyNotFound
@@ -49,3 +53,142 @@ def test_dict(database: StackzillaSQLiteDB):
     database.set_metadata(key='foo', value=value)
 
     assert database.get_metadata(key='foo') == value
+
+def test_transaction(database: StackzillaSQLiteDB):
+    """Verify that a transaction commits once, and rolls everything back on failure."""
+    with database.transaction():
+        database.set_metadata(key='alpha', value=1)
+        database.set_metadata(key='beta', value=2)
+
+    assert database.get_metadata(key='alpha') == 1
+    assert database.get_metadata(key='beta') == 2
+
+    with pytest.raises(RuntimeError):
+        with database.transaction():
+            database.set_metadata(key='gamma', value=3)
+            database.delete_metadata(key='alpha')
+            raise RuntimeError('Abort!')
+
+    assert database.check_metadata(key='gamma') is False
+    assert database.get_metadata(key='alpha') == 1
+
+def test_native_types(database: StackzillaSQLiteDB):
+    """Make sure that values stored natively (and the ones that aren't) come back as the same type."""
+    for value in ['bar', '123', 0, True, None, [1, 'two']]:
+        database.set_metadata(key='foo', value=value)
+        result = database.get_metadata(key='foo')
+        assert result == value
+        assert type(result) == type(value)
+
+def test_large_integer(database: StackzillaSQLiteDB):
+    """Integers too large for a SQLite INTEGER must still round-trip."""
+    for value in [2**70, -2**70, 2**63, -2**63 - 1]:
+        database.set_metadata(key='foo', value=value)
+        assert database.get_metadata(key='foo') == value
+
+def test_non_finite_float(database: StackzillaSQLiteDB):
+    """NaN and infinity must come back as floats, rather than NULL."""
+    database.set_metadata(key='foo', value=float('nan'))
+    assert math.isnan(database.get_metadata(key='foo'))
+
+    for value in [float('inf'), float('-inf')]:
+        database.set_metadata(key='foo', value=value)
+        assert database.get_metadata(key='foo') == value
+
+def test_legacy_metadata(tmp_path):
+    """Verify that JSON metadata written before the type column existed can still be read."""
+    db_name = str(tmp_path / 'legacy')
+    connection = sqlite3.connect(f'{db_name}.db')
+    connection.execute(f'CREATE TABLE {StackzillaSQLiteDB.MetadataTableName} (key text unique, value text)')
+    connection.execute(f'INSERT INTO {StackzillaSQLiteDB.MetadataTableName} VALUES (?, ?)', ('foo', json.dumps({'a': 1})))
+    connection.commit()
+    connection.close()
+
+    database = StackzillaSQLiteDB(name=db_name)
+    database.open()
+
+    try:
+        assert database.get_metadata(key='foo') == {'a': 1}
+
+        # New values written to the old (text) column still come back as the right type
+        database.set_metadata(key='bar', value=42)
+        assert database.get_metadata(key='bar') == 42
+    finally:
+        database.close()
+
+def _attribute_indexes(db_name: str):
+    """Fetch the (name, unique) pairs for the indexes on the attribute table."""
+    connection = sqlite3.connect(f'{db_name}.db')
+    try:
+        return [(row[1], row[2]) for row in connection.execute('PRAGMA index_list(StackzillaAttribute)')]
+    finally:
+        connection.close()
+
+def test_legacy_attribute_index(tmp_path):
+    """Databases created before the attribute index existed get it when they're opened."""
+    db_name = str(tmp_path / 'legacy')
+    database = StackzillaSQLiteDB(name=db_name)
+    database.create()
+    database.close()
+
+    connection = sqlite3.connect(f'{db_name}.db')
+    connection.execute('DROP INDEX idx_attr_resource_name')
+    connection.commit()
+    connection.close()
+
+    database.open()
+    database.close()
+    assert _attribute_indexes(db_name) == [('idx_attr_resource_name', 1)]
+
+    # Duplicate attributes are rejected again
+    connection = sqlite3.connect(f'{db_name}.db')
+    try:
+        connection.execute("INSERT INTO StackzillaResource (id, path) VALUES (1, 'resource')")
+        connection.execute("INSERT INTO StackzillaAttribute (resource_id, name) VALUES (1, 'attr')")
+        with pytest.raises(sqlite3.IntegrityError):
+            connection.execute("INSERT INTO StackzillaAttribute (resource_id, name) VALUES (1, 'attr')")
+    finally:
+        connection.close()
+
+def test_legacy_duplicate_attributes(tmp_path):
+    """A legacy database which already holds duplicate attributes still opens, with a non-unique index."""
+    db_name = str(tmp_path / 'legacy')
+    database = StackzillaSQLiteDB(name=db_name)
+    database.create()
+    database.close()
+
+    connection = sqlite3.connect(f'{db_name}.db')
+    connection.execute('DROP INDEX idx_attr_resource_name')
+    connection.execute("INSERT INTO StackzillaResource (id, path) VALUES (1, 'resource')")
+    connection.executemany('INSERT INTO StackzillaAttribute (resource_id, name) VALUES (?, ?)', [(1, 'attr')] * 2)
+    connection.commit()
+    connection.close()
+
+    database.open()
+    database.close()
+    assert _attribute_indexes(db_name) == [('idx_attr_resource_name', 0)]
+
+def test_vacuum(database: StackzillaSQLiteDB):
+    """Make sure vacuuming leaves the data intact."""
+    database.set_metadata(key='foo', value='bar')
+    database.vacuum()
+    assert database.get_metadata(key='foo') == 'bar'
+
+def test_wal_journal(tmp_path):
+    """Verify that on-disk databases are opened in write-ahead logging mode."""
+    database = StackzillaSQLiteDB(name=str(tmp_path / 'wal'))
+    database.create()
+
+    try:
+        with database.execute('PRAGMA journal_mode', commit=False) as cursor:
+            assert cursor.fetchone()[0] == 'wal'
+    finally:
+        database.close()
+
+    # Re-opening the database must keep it in WAL mode
+    database.open()
+    try:
+        with database.execute('PRAGMA journal_mode', commit=False) as cursor:
+            assert cursor.fetchone()[0] == 'wal'
+    finally:
+        database.close()
@@ -1,5 +1,7 @@
 """Verify the SQLite facility for resources."""
 # pylint: disable=abstract-method
+import base64
+import pickle
 from unittest.mock import patch
 
 import pytest
@@ -99,9 +101,52 @@ def test_get_all_resources(database: StackzillaSQLiteDB):
     for resource in resources:
         assert resource.__class__ in [Resource, OtherResource]
 
+def test_get_all_resources_prefetch(file_database: StackzillaSQLiteDB):
+    """Make sure get_all_resources() loads every attribute up front, instead of one query per attribute."""
+    MyResource().create_in_db()
+    OtherResource().create_in_db()
+
+    # Start over with empty caches
+    file_database.close()
+    file_database.open()
+
+    with patch('stackzilla.database.sqlite.StackzillaSQLiteDB._write_attribute_cache') as write_cache_mock:
+        resources = file_database.get_all_resources()
+        assert write_cache_mock.call_count == 0
+
+    my_resource = [resource for resource in resources if isinstance(resource, MyResource)][0]
+    assert my_resource.default_int == 88
+    assert my_resource.dict_attr == {'alpha': 1, 'beta': 2}
+
+def test_get_resource_single_query(file_database: StackzillaSQLiteDB):
+    """Make sure get_resource() loads all of the attributes with the resource, not one query per attribute."""
+    MyResource().create_in_db()
+    MyOtherResource().create_in_db()
+
+    # Start over with empty caches
+    file_database.close()
+    file_database.open()
+
+    with patch('stackzilla.database.sqlite.StackzillaSQLiteDB._write_attribute_cache') as write_cache_mock:
+        my_resource = file_database.get_resource(path=MyResource.path())
+        assert write_cache_mock.call_count == 0
+
+    assert my_resource.list_attr == ['alpha', 'beta']
+
+    # Only the requested resource was loaded
+    with patch('stackzilla.database.sqlite.StackzillaSQLiteDB._write_attribute_cache') as write_cache_mock:
+        file_database.get_attribute(resource=MyOtherResource(), name='required')
+        assert write_cache_mock.call_count == 1
+
 ################################################################################
 #  Attribute Test Cases
 ################################################################################
+def test_attribute_names():
+    """Verify that inherited attributes are included, and that each class gets its own names."""
+    assert MyResource.attribute_names() == ('default_int', 'dict_attr', 'list_attr', 'required')
+    assert OtherResource.attribute_names() == ('required',)
+    assert list(MyResource().attributes) == list(MyResource.attribute_names())
+
 def test_duplicate_attributes(database: StackzillaSQLiteDB):
     """Verify that you can't create the same attribute twice."""
     my_resource = MyResource()
@@ -162,3 +207,101 @@ def test_attribute_cache_refresh(database: StackzillaSQLiteDB):
         value = database.get_attribute(resource=my_resource, name='default_int', update_cache=True)
         assert value == my_resource.default_int
         assert write_cache_mock.call_count == 1
+
+def test_create_attributes(database: StackzillaSQLiteDB):
+    """Verify that attributes can be created in bulk, and that duplicates are rejected."""
+    my_resource = OtherResource()
+    my_resource.required = 'bulk'
+    database.create_resource(resource=my_resource)
+
+    database.create_attributes(resource=my_resource, items=[('alpha', 1), ('beta', [1, 2])])
+    assert database.get_attribute(resource=my_resource, name='alpha', update_cache=True) == 1
+    assert database.get_attribute(resource=my_resource, name='beta', update_cache=True) == [1, 2]
+
+    # A duplicate anywhere in the batch must fail the entire batch
+    with pytest.raises(DuplicateAttribute):
+        database.create_attributes(resource=my_resource, items=[('gamma', 3), ('alpha', 4)])
+
+    with pytest.raises(AttributeNotFound):
+        database.get_attribute(resource=my_resource, name='gamma', update_cache=True)
+
+def test_create_attributes_chunked(database: StackzillaSQLiteDB):
+    """Verify that a batch larger than a single INSERT statement is fully persisted."""
+    my_resource = OtherResource()
+    my_resource.required = 'chunked'
+    database.create_resource(resource=my_resource)
+
+    items = [(f'attr_{index}', index) for index in range(700)]
+    database.create_attributes(resource=my_resource, items=items)
+
+    for name, value in items:
+        assert database.get_attribute(resource=my_resource, name=name, update_cache=True) == value
+
+    # A duplicate in the last chunk must roll back the earlier chunks too
+    items = [(f'more_{index}', index) for index in range(650)] + [('attr_0', 0)]
+    with pytest.raises(DuplicateAttribute):
+        database.create_attributes(resource=my_resource, items=items)
+
+    with pytest.raises(AttributeNotFound):
+        database.get_attribute(resource=my_resource, name='more_0', update_cache=True)
+
+def test_legacy_attribute_encoding(database: StackzillaSQLiteDB):
+    """Attribute values stored as base64 text by older versions must still decode."""
+    my_resource = MyResource()
+    database.create_resource(resource=my_resource)
+
+    legacy_value = base64.encodebytes(pickle.dumps({'legacy': True})).decode('ascii')
+    with database.execute(query='UPDATE StackzillaAttribute SET value=:value WHERE name=:name',
+                          params={'value': legacy_value, 'name': 'dict_attr'}):
+        pass
+
+    assert database.get_attribute(resource=my_resource, name='dict_attr', update_cache=True) == {'legacy': True}
+
+def test_resource_id_cache_eviction(database: StackzillaSQLiteDB):
+    """Make sure a deleted and re-created resource doesn't use a stale cached ID."""
+    my_resource = MyResource()
+    database.create_resource(resource=my_resource)
+    assert database.get_attribute(resource=my_resource, name='default_int', update_cache=True) == 88
+
+    database.delete_resource(path=my_resource.path())
+    with pytest.raises(ResourceNotFound):
+        database.get_attribute(resource=my_resource, name='default_int', update_cache=True)
+
+    # Re-create the resource with a different value
+    my_resource.default_int = 99
+    database.create_resource(resource=my_resource)
+    assert database.get_attribute(resource=my_resource, name='default_int', update_cache=True) == 99
+
+def test_delete_resource_cascade(database: StackzillaSQLiteDB):
+    """Deleting a resource must remove its attributes from the database and the attribute cache."""
+    my_resource = MyResource()
+    database.create_resource(resource=my_resource)
+    database.delete_resource(path=my_resource.path())
+
+    with pytest.raises(ResourceNotFound):
+        database.get_attribute(resource=my_resource, name='default_int')
+
+    with database.execute(query='SELECT COUNT(*) FROM StackzillaAttribute', commit=False) as cursor:
+        assert cursor.fetchone()[0] == 0
+
+def test_delete_from_db(database: StackzillaSQLiteDB):
+    """Make sure deleting a resource through the resource itself removes all of its attributes."""
+    my_resource = MyResource()
+    my_resource.create_in_db()
+    my_resource.delete_from_db()
+
+    with database.execute(query='SELECT COUNT(*) FROM StackzillaAttribute', commit=False) as cursor:
+        assert cursor.fetchone()[0] == 0
+
+    # Deleting it a second time is harmless
+    my_resource.delete_from_db()
+
+def test_get_resource_class_cache(database: StackzillaSQLiteDB):
+    """The resource class should only be imported the first time it's fetched."""
+    database.create_resource(resource=MyResource())
+    path = 'database.tests.test_resource.MyResource'
+    assert database.get_resource(path=path).__class__ == MyResource
+
+    with patch('stackzilla.database.sqlite.importlib.import_module') as import_mock:
+        assert database.get_resource(path=path).__class__ == MyResource
+        assert import_mock.call_count == 0
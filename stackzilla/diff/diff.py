@@ -1,16 +1,16 @@
 """Module that has all of the logic for diffing imported blueprints."""
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import (FIRST_COMPLETED, Future, ThreadPoolExecutor,
+                                wait)
 from dataclasses import dataclass
 from enum import Enum, auto
 from io import StringIO
-from typing import Any, Dict, List, Optional, Tuple, Type
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple, Type
 
 from colorama import Fore, Style
 
 from stackzilla.attribute import StackzillaAttribute
 from stackzilla.blueprint.blueprint import StackzillaBlueprint
 from stackzilla.database.base import StackzillaDB
-from stackzilla.database.exceptions import ResourceNotFound
 from stackzilla.diff.exceptions import (ApplyErrors, NoDiffError,
                                         UnhandledAttributeModifications,
                                         VersionIncompatibility)
@@ -36,10 +36,38 @@ class StackzillaDiffResult(Enum):
     SAME = auto()
 
 
+# Module path prefixes for the database and disk blueprint namespaces
+_DB_BP_MODULE_PREFIX = f'{DB_BP_PREFIX}.'
+_DISK_BP_MODULE_PREFIX = f'{DISK_BP_PREFIX}.'
+
+# Colorized output templates for StackzillaAttributeDiff.print(), keyed by the attribute's diff result
+_ATTRIBUTE_FORMATS = {
+    StackzillaDiffResult.NEW: Fore.GREEN + '++\t{name}: <none> => {src}\n',
+    StackzillaDiffResult.DELETED: Fore.RED + '--\t{name}\n',
+    StackzillaDiffResult.CONFLICT: Fore.YELLOW + '@@\t{name}: {dest} => {src}\n',
+}
+
+# Conflicting attributes that force the resource to be rebuilt
+_ATTRIBUTE_REBUILD_FORMAT = Fore.YELLOW + '!!\t{name}: {dest} => {src}\n'
+_ATTRIBUTE_DEFAULT_FORMAT = Fore.WHITE + '  \t{name}: {dest} => {src}\n'
+
+# Colorized header templates for StackzillaResourceDiff.print(), keyed by the resource's diff result
+_RESOURCE_HEADER_FORMATS = {
+    StackzillaDiffResult.DELETED: Fore.RED + '[{path}] DELETING\n',
+    StackzillaDiffResult.NEW: Fore.GREEN + '[{path}] CREATING\n',
+    StackzillaDiffResult.REBUILD_REQUIRED: Fore.RED + '[{path}] REBUILD REQUIRED. See attributes marked with "!!"\n',
+    StackzillaDiffResult.CONFLICT: Fore.YELLOW + '[{path}] UPDATING\n',
+}
+
+_RESET = Style.RESET_ALL
+
+
 @dataclass
 class StackzillaAttributeDiff:
     """Results for the diff operation on a single attribute."""
 
+    __slots__ = ('src_value', 'dest_value', 'src_attribute', 'dest_attribute', 'result')
+
     src_value: Optional[Any]
     dest_value: Optional[Any]
     src_attribute: Optional[StackzillaAttribute]
@@ -93,22 +121,31 @@ class StackzillaAttributeDiff:
         Args:
             buffer (StringIO): Buffer to write to
         """
-        if self.result == StackzillaDiffResult.NEW:
-            buffer.write(Fore.GREEN + f'++\t{self.name()}: <none> => {self.filtered_src_value()}\n')
-        elif self.result == StackzillaDiffResult.DELETED:
-            buffer.write(Fore.RED + f'--\t{self.name()}\n')
-        elif self.result == StackzillaDiffResult.CONFLICT:
-            if self.src_attribute.modify_rebuild:
-                buffer.write(Fore.YELLOW + f'!!\t{self.name()}: {self.filtered_dest_value()} => {self.filtered_src_value()}\n')
-            else:
-                buffer.write(Fore.YELLOW + f'@@\t{self.name()}: {self.filtered_dest_value()} => {self.filtered_src_value()}\n')
+        buffer.write(self.render())
+
+    def render(self) -> str:
+        """Render the attribute diff as a (colorized) line of text.
+
+        Returns:
+            str: The line, including the trailing newline
+        """
+        if self.result == StackzillaDiffResult.CONFLICT and self.src_attribute.modify_rebuild:
+            template = _ATTRIBUTE_REBUILD_FORMAT
         else:
-            buffer.write(Fore.WHITE + f'  \t{self.name()}: {self.filtered_dest_value()} => {self.filtered_src_value()}\n')
+            template = _ATTRIBUTE_FORMATS.get(self.result, _ATTRIBUTE_DEFAULT_FORMAT)
+
+        # Each side only exists for some of the results (there's no source for a deleted attribute, for example)
+        src = self.filtered_src_value() if self.src_attribute else None
+        dest = self.filtered_dest_value() if self.dest_attribute else None
+
+        return template.format(name=self.name(), src=src, dest=dest)
 
 @dataclass
 class StackzillaResourceDiff:
     """Data structure to hold the results of a resource to resource diff."""
 
+    __slots__ = ('src_resource', 'dest_resource', 'result', 'attribute_diffs')
+
     src_resource: Optional[StackzillaResource]
     dest_resource: Optional[StackzillaResource]
     result: StackzillaDiffResult
@@ -126,42 +163,48 @@ class StackzillaResourceDiff:
 
         # ALWAYS Remove the leading '..' or DB prefix
         path = removeprefix(string=path, prefix='..')
-        path = removeprefix(string=path, prefix=f'{DB_BP_PREFIX}.')
-        path = removeprefix(string=path, prefix=f'{DISK_BP_PREFIX}.')
+        path = removeprefix(string=path, prefix=_DB_BP_MODULE_PREFIX)
+        path = removeprefix(string=path, prefix=_DISK_BP_MODULE_PREFIX)
 
         return path
 
     def print(self, buffer: StringIO) -> None:
         """Print the diff results to the buffer."""
-        if self.result == StackzillaDiffResult.DELETED:
-            buffer.write(Fore.RED + f'[{self.path()}] DELETING\n')
-        elif self.result == StackzillaDiffResult.NEW:
-            buffer.write(Fore.GREEN + f'[{self.path()}] CREATING\n')
-        elif self.result == StackzillaDiffResult.REBUILD_REQUIRED:
-            buffer.write(Fore.RED + f'[{self.path()}] REBUILD REQUIRED. See attributes marked with "!!"\n')
-        elif self.result == StackzillaDiffResult.CONFLICT:
-            buffer.write(Fore.YELLOW + f'[{self.path()}] UPDATING\n')
-        elif self.result == StackzillaDiffResult.SAME:
+        if self.result == StackzillaDiffResult.SAME:
             return
-        else:
+
+        template = _RESOURCE_HEADER_FORMATS.get(self.result)
+        if template is None:
             raise RuntimeError(f'Unhandled state: {self.result}')
 
-        for attribute in self.attribute_diffs.values():
-            attribute.print(buffer)
+        header = template.format(path=self.path())
+
+        # Build the whole block of text, then hand it to the buffer with a single write
+        lines = [header]
+        lines.extend(attribute.render() for attribute in self.attribute_diffs.values())
+        buffer.write(''.join(lines))
 
 @dataclass
 class StackzillaBlueprintDiff:
     """The top-most level of diff."""
 
+    __slots__ = ('resource_diffs', 'result')
+
+    # Resources that are the SAME in both blueprints are omitted
     resource_diffs: Dict[str, StackzillaResourceDiff]
 
     # Valid values are SAME or CONFLICT
     result: StackzillaDiffResult
 
+# Signature of the StackzillaDiff._apply_*() handlers: (resource class, resource diff, errors)
+_ApplyHandler = Callable[[Type[StackzillaResource], StackzillaResourceDiff, List[str]], None]
+
 @dataclass
 class StackzillaDiffApplyResult:
     """The results for the application of a single resource."""
 
+    __slots__ = ('resource_name', 'result', 'error')
+
     resource_name: str
     result: str
     error: str
@@ -173,9 +216,25 @@ class StackzillaDiff:
         """Default constructor."""
         self._result: StackzillaBlueprintDiff = None
         self._src_blueprint: StackzillaBlueprint = None
-        self._dest_blueprint: StackzillaBlueprint = None
+
+        # The blueprint resources from the previous diff, keyed by their prefix-free paths. The destination only
+        # holds resources that were found in the database.
+        self._src_resources: Dict[str, Type[StackzillaResource]] = {}
+        self._dest_resources: Dict[str, Type[StackzillaResource]] = {}
+
+        # The source resource instances created by the previous diff, keyed the same as _src_resources
+        self._src_objs: Dict[str, StackzillaResource] = {}
         self._logger: CoreLogger = CoreLogger(component='diff')
 
+        # The apply handler for each of the resource diff results
+        self._apply_dispatch: Dict[StackzillaDiffResult, _ApplyHandler] = {
+            StackzillaDiffResult.CONFLICT: self._apply_conflict,
+            StackzillaDiffResult.REBUILD_REQUIRED: self._apply_rebuild,
+            StackzillaDiffResult.DELETED: self._apply_delete,
+            StackzillaDiffResult.NEW: self._apply_new,
+            StackzillaDiffResult.SAME: self._apply_same,
+        }
+
     @property
     def result(self) -> StackzillaBlueprintDiff:
         """Fetch the result of the previous diff operation."""
@@ -187,14 +246,13 @@ class StackzillaDiff:
     # pylint: disable=too-many-locals,too-many-branches
     def apply(self):
         """Resolve the blueprint graph and apply differences."""
-        # Create a graph from the source blueprint
+        # Create a graph from the source blueprint, reusing the instances created by diff()
         graph = Graph()
-        for imported_class in self._src_blueprint.resources.values():
-            obj = imported_class()
-            graph.add_node(imported_class, obj.depends_on())
+        for resource_name, imported_class in self._src_resources.items():
+            graph.add_node(imported_class, self._src_objs[resource_name].depends_on())
 
         # Raises CircularDependency if the graph can not be resolved
-        phases = graph.resolve()
+        graph.resolve()
 
         # Implementation Note
         # The blueprint is purposefully being persisted to the database BEFORE it is applied.
@@ -202,36 +260,57 @@ class StackzillaDiff:
         #  have the data but we need to know what the last blueprint used was.
 
         # Check the destination blueprint for resources not in the source blueprint (deleted)
-        for resource_name in self._dest_blueprint.resources:
-            if resource_name not in self._src_blueprint.resources:
-                deleted_resource = self._dest_blueprint.resources[resource_name].from_db()
-                deleted_resource.delete()
+        for resource_name in self._dest_resources:
+            if resource_name not in self._src_resources:
+                self._result.resource_diffs[resource_name].dest_resource.delete()
+
+        # Replace the stored blueprint with a single commit, so it's never left half written
+        with StackzillaDB.db.transaction():
+            # Dump all of the packages to the database
+            StackzillaDB.db.delete_all_blueprint_packages()
+            for package_name in self._src_blueprint.packages:
+                StackzillaDB.db.create_blueprint_package(path=package_name)
+
+            # Dump all of the modules to the databse
+            StackzillaDB.db.delete_all_blueprint_modules()
+            for module in self._src_blueprint.modules.values():
+                StackzillaDB.db.create_blueprint_module(path=module.path, data=module.data)
+
+        # Rather than applying the graph one phase at a time (where a phase waits on the slowest resource of the
+        # phase before it), a resource is started as soon as everything it depends on has been applied.
+        dependencies = graph.dependencies()
+
+        # The number of dependencies each resource is still waiting on, and the resources waiting on each resource
+        waiting_on: Dict[Type[StackzillaResource], int] = {}
+        dependents: Dict[Type[StackzillaResource], List[Type[StackzillaResource]]] = {}
+        for resource, resource_dependencies in dependencies.items():
+            waiting_on[resource] = len(resource_dependencies)
+            dependents.setdefault(resource, [])
+            for dependency in resource_dependencies:
+                dependents.setdefault(dependency, []).append(resource)
 
-        # Dump all of the packages to the database
-        StackzillaDB.db.delete_all_blueprint_packages()
-        for package_name in self._src_blueprint.packages:
-            StackzillaDB.db.create_blueprint_package(path=package_name)
+        errors: List[str] = []
 
-        # Dump all of the modules to the databse
-        StackzillaDB.db.delete_all_blueprint_modules()
-        for module in self._src_blueprint.modules.values():
-            StackzillaDB.db.create_blueprint_module(path=module.path, data=module.data)
+        with ThreadPoolExecutor() as executor:
 
-        errors: List[str] = []
-        for phase in phases:
+            pending: Dict[Future, Type[StackzillaResource]] = {}
 
-            with ThreadPoolExecutor() as executor:
+            def submit(resource: Type[StackzillaResource]):
+                self._logger.debug(f'Applying resource: {resource}')
+                pending[executor.submit(self._apply_resource, resource=resource)] = resource
 
-                self._logger.debug(f'Resources being applied in this phase: {phase}')
+            for resource, count in waiting_on.items():
+                if count == 0:
+                    submit(resource)
 
-                # Apply the diff for all of the resources in this phase
-                futures = []
-                for resource in phase:
-                    futures.append(executor.submit(self._apply_resource, resource=resource))
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
 
                 # Process the results
-                for result in as_completed(futures):
-                    exception = result.exception()
+                for future in done:
+                    resource = pending.pop(future)
+
+                    exception = future.exception()
                     if exception:
 
                         # If this is a provider error, raise it immediately.
@@ -242,10 +321,20 @@ class StackzillaDiff:
                             errors.extend(exception.errors)
                         else:
                             errors.append(str(exception))
-            if errors:
-                raise ApplyErrors(errors=errors)
 
-    # pylint: disable=too-many-branches,too-many-locals,too-many-statements,line-too-long
+                    # Once anything has failed, let the in-flight resources finish but don't start anything new
+                    if errors:
+                        continue
+
+                    for dependent in dependents[resource]:
+                        waiting_on[dependent] -= 1
+                        if waiting_on[dependent] == 0:
+                            submit(dependent)
+
+        if errors:
+            raise ApplyErrors(errors=errors)
+
+    # pylint: disable=line-too-long
     def _apply_resource(self, resource: Type[StackzillaResource]):
         """Apply the diff for a spacified resource."""
         errors = []
@@ -254,109 +343,134 @@ class StackzillaDiff:
         # pylint: disable=unused-import,import-outside-toplevel
         import pssh.clients.ssh
 
-        # Need to load the resource from the database so that any dynamic attributes are present
-        # NOTE: If the resource is not in the database, no big deal, we'll just instantiate the object directly
-        try:
-            obj = resource.from_db()
-        except ResourceNotFound:
-            obj = resource()
-
-        diff: StackzillaResourceDiff = self._result.resource_diffs[obj.path()]
-
-        if diff.result == StackzillaDiffResult.CONFLICT:
-
-            # Build a dictionary of AttributeModified objects to track what has and hasn't been handled.
-            modified_attrs = {}
-            for attr_name, attr_diff in diff.attribute_diffs.items():
-                modified_attrs[attr_name] = AttributeModified(name=attr_name,
-                                                                previous_value=attr_diff.dest_value,
-                                                                new_value=attr_diff.src_value,
-                                                                handled=False)
-
-            # Invoke any StackzillaResource::*_modified() handlers
-            for attr_name, attr_diff in diff.attribute_diffs.items():
-                # _on_attribute_modified() should only be accessed from here.
-                # pylint: disable=protected-access
-                try:
-                    if obj._on_attribute_modified(attribute_name=attr_name,
-                                                  previous_value=attr_diff.dest_value,
-                                                  new_value=attr_diff.src_value):
-
-                        # Note that the attribute modification has been handled
-                        modified_attrs[attr_name].handled = True
-
-                        # Invoke the individual event handler
-                        obj.attribute_modified_event.invoke(sender=obj,
-                                                            attribute_name=attr_name,
-                                                            previous_value=attr_diff.dest_value,
-                                                            new_value=attr_diff.src_value)
-                except AttributeModifyFailure as exc:
-                    modified_attrs[attr_name].error = exc
-
-            # Invoke the "all-in-one" handler
-            obj.on_attributes_modified(attributes=modified_attrs)
-
-            # Invoke the callback handler for all events
-            obj.attributes_modified_event.invoke(sender=obj, attriubtes=modified_attrs)
-
-            # Check for any unhandled attributes
-            unhandled_attributes = []
-            for attribute in modified_attrs.values():
-                # Just log an error and continue onward. Do NOT persist the value to the database.
-                if attribute.error:
-                    errors.append(f'{obj.path(remove_prefix=True)}: {attribute.name} - {attribute.error.reason} ')
-                elif attribute.handled is False:
-                    # The attribute wasn't handled - get ready to log a failure!
-                    unhandled_attributes.append(attribute)
-                else:
-                    # Persist the attribute to the database
-                    StackzillaDB.db.update_attribute(resource=obj, name=attribute.name, value=attribute.new_value)
-
-            if unhandled_attributes:
-
-                if errors:
-                    self._logger.critical('Attribute modify encountered during unhandled attribute exception')
-                    self._logger.critical(errors)
-
-                # Since this is actually a provider failure (usually hit during creation of the provider) it will
-                # raise its own excption and "mask" the modify attribute failures. The developer should fix this
-                # issue first!
-                raise UnhandledAttributeModifications(unhandled_attributes)
-
-        elif diff.result == StackzillaDiffResult.REBUILD_REQUIRED:
-            diff.dest_resource.delete()
-            diff.dest_resource.delete_done_event.invoke(sender=diff.dest_resource)
-            try:
-                diff.src_resource.create()
-                diff.src_resource.rebuild_done_event.invoke(sender=diff.src_resource)
-            except ResourceCreateFailure as exc:
-                errors.append(f'{exc.resource_name}: {exc.reason}')
-            except HandlerException as exc:
-                errors.append(f'create handler failed with: {str(exc)}')
-
-        elif diff.result == StackzillaDiffResult.DELETED:
-            try:
-                diff.dest_resource.delete()
-                diff.dest_resource.delete_done_event.invoke(sender=diff.dest_resource)
-            except ResourceDeleteFailure as exc:
-                errors.append(f'{exc.resource_name}: {exc.reason}')
-        elif diff.result == StackzillaDiffResult.NEW:
-            try:
-                diff.src_resource.create()
-                diff.src_resource.create_done_event.invoke(sender=diff.src_resource)
-            except ResourceCreateFailure as exc:
-                errors.append(f'{exc.resource_name}: {exc.reason}')
-            except HandlerException as exc:
-                errors.append(str(exc))
-
-        elif diff.result == StackzillaDiffResult.SAME:
+        diff: Optional[StackzillaResourceDiff] = self._result.resource_diffs.get(resource.path())
+
+        # Unchanged resources aren't part of the diff results, there's nothing to apply
+        if diff is None:
             return
-        else:
+
+        handler = self._apply_dispatch.get(diff.result)
+        if handler is None:
             raise RuntimeError('Unhandled state')
 
+        handler(resource, diff, errors)
+
         if errors:
             raise ApplyErrors(errors=errors)
 
+    # pylint: disable=too-many-locals
+    def _apply_conflict(self, resource: Type[StackzillaResource], diff: StackzillaResourceDiff, errors: List[str]):
+        """Apply the attribute modifications for a resource that already exists.
+
+        Args:
+            resource (Type[StackzillaResource]): The source blueprint class for the resource
+            diff (StackzillaResourceDiff): The diff results for the resource
+            errors (List[str]): Any attribute modification errors are appended here
+
+        Raises:
+            UnhandledAttributeModifications: Raised if a modified attribute didn't have a handler
+        """
+        # diff() already built (and loaded) the resources for every other result, so only go back to the database
+        # when the modify handlers need to see the dynamic attributes of the existing resource.
+        obj = resource.from_db()
+
+        # Build a dictionary of AttributeModified objects to track what has and hasn't been handled.
+        modified_attrs = {}
+        for attr_name, attr_diff in diff.attribute_diffs.items():
+            modified_attrs[attr_name] = AttributeModified(name=attr_name,
+                                                            previous_value=attr_diff.dest_value,
+                                                            new_value=attr_diff.src_value,
+                                                            handled=False)
+
+        # Invoke any StackzillaResource::*_modified() handlers
+        for attr_name, attr_diff in diff.attribute_diffs.items():
+            # _on_attribute_modified() should only be accessed from here.
+            # pylint: disable=protected-access
+            try:
+                if obj._on_attribute_modified(attribute_name=attr_name,
+                                              previous_value=attr_diff.dest_value,
+                                              new_value=attr_diff.src_value):
+
+                    # Note that the attribute modification has been handled
+                    modified_attrs[attr_name].handled = True
+
+                    # Invoke the individual event handler
+                    obj.attribute_modified_event.invoke(sender=obj,
+                                                        attribute_name=attr_name,
+                                                        previous_value=attr_diff.dest_value,
+                                                        new_value=attr_diff.src_value)
+            except AttributeModifyFailure as exc:
+                modified_attrs[attr_name].error = exc
+
+        # Invoke the "all-in-one" handler
+        obj.on_attributes_modified(attributes=modified_attrs)
+
+        # Invoke the callback handler for all events
+        obj.attributes_modified_event.invoke(sender=obj, attriubtes=modified_attrs)
+
+        # Check for any unhandled attributes
+        unhandled_attributes = []
+        for attribute in modified_attrs.values():
+            # Just log an error and continue onward. Do NOT persist the value to the database.
+            if attribute.error:
+                errors.append(f'{obj.path(remove_prefix=True)}: {attribute.name} - {attribute.error.reason} ')
+            elif attribute.handled is False:
+                # The attribute wasn't handled - get ready to log a failure!
+                unhandled_attributes.append(attribute)
+            else:
+                # Persist the attribute to the database
+                StackzillaDB.db.update_attribute(resource=obj, name=attribute.name, value=attribute.new_value)
+
+        if unhandled_attributes:
+
+            if errors:
+                self._logger.critical('Attribute modify encountered during unhandled attribute exception')
+                self._logger.critical(errors)
+
+            # Since this is actually a provider failure (usually hit during creation of the provider) it will
+            # raise its own excption and "mask" the modify attribute failures. The developer should fix this
+            # issue first!
+            raise UnhandledAttributeModifications(unhandled_attributes)
+
+    def _apply_rebuild(self, resource: Type[StackzillaResource], diff: StackzillaResourceDiff, errors: List[str]):
+        """Delete and recreate a resource that has a modified rebuild attribute."""
+        # pylint: disable=unused-argument
+        old_obj, new_obj = diff.dest_resource, diff.src_resource
+        old_obj.delete()
+        old_obj.delete_done_event.invoke(sender=old_obj)
+        try:
+            new_obj.create()
+            new_obj.rebuild_done_event.invoke(sender=new_obj)
+        except ResourceCreateFailure as exc:
+            errors.append(f'{exc.resource_name}: {exc.reason}')
+        except HandlerException as exc:
+            errors.append(f'create handler failed with: {str(exc)}')
+
+    def _apply_delete(self, resource: Type[StackzillaResource], diff: StackzillaResourceDiff, errors: List[str]):
+        """Delete a resource that is no longer in the blueprint."""
+        # pylint: disable=unused-argument
+        obj = diff.dest_resource
+        try:
+            obj.delete()
+            obj.delete_done_event.invoke(sender=obj)
+        except ResourceDeleteFailure as exc:
+            errors.append(f'{exc.resource_name}: {exc.reason}')
+
+    def _apply_new(self, resource: Type[StackzillaResource], diff: StackzillaResourceDiff, errors: List[str]):
+        """Create a resource that is new to the blueprint."""
+        # pylint: disable=unused-argument
+        obj = diff.src_resource
+        try:
+            obj.create()
+            obj.create_done_event.invoke(sender=obj)
+        except ResourceCreateFailure as exc:
+            errors.append(f'{exc.resource_name}: {exc.reason}')
+        except HandlerException as exc:
+            errors.append(str(exc))
+
+    def _apply_same(self, resource: Type[StackzillaResource], diff: StackzillaResourceDiff, errors: List[str]):
+        """Nothing to do for a resource that hasn't changed."""
+
     # pylint: disable=too-many-branches,too-many-locals
     def diff(self, source: Optional[StackzillaBlueprint], destination: Optional[StackzillaBlueprint]):
         """Diff the source (disk) blueprint against the destination (database) blueprint.
@@ -369,107 +483,73 @@ class StackzillaDiff:
             StackzillaBlueprintDiff: The results of the diff operation
         """
         self._src_blueprint = source
-        self._dest_blueprint = destination
 
         result = StackzillaDiffResult.SAME
         diffs: Dict[str, StackzillaResourceDiff] = {}
 
-        src_resources: Dict[str, StackzillaResource] = source.resources
-        dest_resources: Dict[str, StackzillaResource] = destination.resources
-
         # The keys for the src_resource are prefixed with the 'sz_disk_bp' prefix.
-        src_resource_names_original = list(src_resources)
-        for resource_name in src_resource_names_original:
-            new_key_name = resource_name.replace(DISK_BP_PREFIX, '.')
-            src_resources[new_key_name] = src_resources[resource_name]
-            del src_resources[resource_name]
+        # New dictionaries are built, rather than re-keying the blueprints' own, so that the blueprints are left
+        # untouched and diff() can safely be called more than once.
+        src_resources: Dict[str, Type[StackzillaResource]] = {
+            resource_name.replace(DISK_BP_PREFIX, '.'): resource for resource_name, resource in source.resources.items()
+        }
 
         # The keys for dest_resource are prefixed with the 'sz_db_bp' prefix. Replace it with '.' to match
         # the blueprint paths in a non-namespaced blueprint.
         # ex: sb_db_bp.servers.webserver.MyWebserverVolume => ..servers.webserver.MyWebserverVolume
-        dest_resource_names_original = list(dest_resources)
-        for resource_name in dest_resource_names_original:
-            new_key_name = resource_name.replace(DB_BP_PREFIX, '.')
-            dest_resources[new_key_name] = dest_resources[resource_name]
-            del dest_resources[resource_name]
-
-        # If the blueprint contains resources not in the database, omit them from consideration
-        for resource_name in list(dest_resources.keys()):
-            dest_resource: StackzillaResource = dest_resources[resource_name]
-
-            try:
-                dest_resource.from_db()
-            except ResourceNotFound:
-                del dest_resources[resource_name]
-
-        # Pass 1 - diff the source against the destination
-        for resource_name in src_resources:
-
-            # NOTE: We are instantiating the resource object and using that instead of the class object
-            src_resource: StackzillaResource = src_resources[resource_name]()
-
-            # Is the resource available in both the source and destination
-            if resource_name in dest_resources:
-                dest_resource: StackzillaResource = dest_resources[resource_name]
-                dest_obj = dest_resource.from_db()
-
-                # Check for version incompatibilities
-                self.compare_versions(source=src_resource, destination=dest_obj)
-
-                # Diff the resource versions
-                attr_diff_result, attr_diffs = self.compare_attributes(source=src_resource, destination=dest_obj)
-
-                if attr_diff_result == StackzillaDiffResult.SAME:
-                    # Nothing to do - move along!
-                    diffs[resource_name] = StackzillaResourceDiff(src_resource=src_resource,
-                                                                  dest_resource=dest_obj,
-                                                                  result=StackzillaDiffResult.SAME,
-                                                                  attribute_diffs={})
-                    continue
-
-                if attr_diff_result in [StackzillaDiffResult.CONFLICT, StackzillaDiffResult.REBUILD_REQUIRED]:
-                    result = attr_diff_result
-                    diffs[resource_name] = StackzillaResourceDiff(src_resource=src_resource,
-                                                                  dest_resource=dest_obj,
-                                                                  result=result,
-                                                                  attribute_diffs=attr_diffs)
+        dest_resources: Dict[str, Type[StackzillaResource]] = {
+            resource_name.replace(DB_BP_PREFIX, '.'): resource for resource_name, resource in destination.resources.items()
+        }
+
+        # Load every destination resource from the database. Each load is independent (and bound by the database),
+        # so they're run concurrently. If the blueprint contains resources not in the database, omit them from
+        # consideration.
+        with ThreadPoolExecutor() as executor:
+            loaded = list(executor.map(lambda resource: resource.from_db(silent_fail=True), dest_resources.values()))
+
+        dest_objs: Dict[str, StackzillaResource] = {
+            resource_name: dest_obj for resource_name, dest_obj in zip(dest_resources, loaded) if dest_obj is not None
+        }
+        dest_resources = {resource_name: dest_resources[resource_name] for resource_name in dest_objs}
+
+        self._src_resources = src_resources
+        self._dest_resources = dest_resources
+
+        # Pass 1 - diff the source against the destination. Every resource is independent of the others, so they're
+        # diffed concurrently. map() keeps the results in blueprint order, and re-raises the first exception (such
+        # as VersionIncompatibility) when the results are collected.
+        with ThreadPoolExecutor() as executor:
+            resource_diffs = list(executor.map(self._diff_resource,
+                                               src_resources.values(),
+                                               [dest_objs.get(resource_name) for resource_name in src_resources]))
+
+        self._src_objs = {}
+        for resource_name, resource_diff in zip(src_resources, resource_diffs):
+            self._src_objs[resource_name] = resource_diff.src_resource
+
+            # Only keep track of the resources that have changed
+            if resource_diff.result == StackzillaDiffResult.SAME:
+                continue
 
-                else:
-                    raise RuntimeError('Invalid diff result detected')
+            diffs[resource_name] = resource_diff
 
-            else:
+            if resource_diff.result == StackzillaDiffResult.NEW:
                 result = StackzillaDiffResult.CONFLICT
+            else:
+                result = resource_diff.result
 
-                # All of the attributes are new, create "diff" objects for them.
-                new_attr_diffs = {}
-                src_attributes = src_resource.attributes
-                for attr_name in src_attributes:
-                    new_attr_diffs[attr_name] = StackzillaAttributeDiff(src_attribute=src_attributes[attr_name],
-                                                                      dest_attribute=None,
-                                                                      result=StackzillaDiffResult.NEW,
-                                                                      src_value=src_resource.get_attribute_value(attr_name),
-                                                                      dest_value=None)
-
-                # This is a new resource
-                diffs[resource_name] = StackzillaResourceDiff(src_resource=src_resource,
-                                                            dest_resource=None,
-                                                            result=StackzillaDiffResult.NEW,
-                                                            attribute_diffs=new_attr_diffs)
-
-        # Pass 2 - diff the destination against the source, looking for resources that have been deleted
-        for resource_name in dest_resources:
-            # NOTE: We are using an object instance here
-            dest_resource: StackzillaResource = dest_resources[resource_name]()
-
-            # No need to diff this again
-            if resource_name in diffs:
-                continue
+        # Pass 2 - diff the destination against the source, looking for resources that have been deleted.
+        # Everything else in the destination was already diffed in pass 1, so only visit what's left over.
+        deleted_names = [resource_name for resource_name in dest_resources if resource_name not in src_resources]
+        for resource_name in deleted_names:
+            # Reuse the instance that was loaded from the database above
+            dest_resource: StackzillaResource = dest_objs[resource_name]
 
             result = StackzillaDiffResult.CONFLICT
 
             # All of the attributes are new, create "diff" objects for them.
             old_attr_diffs = {}
-            dest_attributes = dest_resource.attributes
+            dest_attributes = dest_resource.class_attributes()
             for attr_name in dest_attributes:
                 old_attr_diffs[attr_name] = StackzillaAttributeDiff(src_attribute=None,
                                                                   dest_attribute=dest_attributes[attr_name],
@@ -485,6 +565,63 @@ class StackzillaDiff:
 
         self._result = StackzillaBlueprintDiff(resource_diffs=diffs, result=result)
 
+    def _diff_resource(self,
+                       src_class: Type[StackzillaResource],
+                       dest_obj: Optional[StackzillaResource]) -> StackzillaResourceDiff:
+        """Diff a single source resource against its (database loaded) destination.
+
+        Args:
+            src_class (Type[StackzillaResource]): The source (disk) resource class
+            dest_obj (Optional[StackzillaResource]): The destination resource, or None if it isn't in the database
+
+        Raises:
+            VersionIncompatibility: Raised when the provider versions are incompatible
+
+        Returns:
+            StackzillaResourceDiff: The diff for the resource
+        """
+        # NOTE: We are instantiating the resource object and using that instead of the class object
+        src_resource: StackzillaResource = src_class()
+
+        # Is the resource available in both the source and destination
+        if dest_obj is not None:
+            # Check for version incompatibilities
+            self.compare_versions(source=src_resource, destination=dest_obj)
+
+            # Diff the resource versions
+            attr_diff_result, attr_diffs = self.compare_attributes(source=src_resource, destination=dest_obj)
+
+            if attr_diff_result == StackzillaDiffResult.SAME:
+                # Nothing to do - move along!
+                return StackzillaResourceDiff(src_resource=src_resource,
+                                              dest_resource=dest_obj,
+                                              result=StackzillaDiffResult.SAME,
+                                              attribute_diffs={})
+
+            if attr_diff_result in [StackzillaDiffResult.CONFLICT, StackzillaDiffResult.REBUILD_REQUIRED]:
+                return StackzillaResourceDiff(src_resource=src_resource,
+                                              dest_resource=dest_obj,
+                                              result=attr_diff_result,
+                                              attribute_diffs=attr_diffs)
+
+            raise RuntimeError('Invalid diff result detected')
+
+        # All of the attributes are new, create "diff" objects for them.
+        new_attr_diffs = {}
+        src_attributes = src_resource.class_attributes()
+        for attr_name in src_attributes:
+            new_attr_diffs[attr_name] = StackzillaAttributeDiff(src_attribute=src_attributes[attr_name],
+                                                              dest_attribute=None,
+                                                              result=StackzillaDiffResult.NEW,
+                                                              src_value=src_resource.get_attribute_value(attr_name),
+                                                              dest_value=None)
+
+        # This is a new resource
+        return StackzillaResourceDiff(src_resource=src_resource,
+                                      dest_resource=None,
+                                      result=StackzillaDiffResult.NEW,
+                                      attribute_diffs=new_attr_diffs)
+
     def compare_attributes(self,
                 source: StackzillaResource,
                 destination: StackzillaResource) -> Tuple[StackzillaDiffResult, Dict[str, StackzillaAttributeDiff]]:
@@ -502,90 +639,77 @@ class StackzillaDiff:
 
         results: Dict[str, StackzillaAttributeDiff] = {}
 
-        src_attributes: Dict[str, StackzillaAttribute] = source.attributes
-        dest_attributes: Dict[str, StackzillaAttribute] = destination.attributes
+        # Only the attribute definitions are needed here, the values are read separately below
+        src_attributes: Mapping[str, StackzillaAttribute] = source.class_attributes()
+        dest_attributes: Mapping[str, StackzillaAttribute] = destination.class_attributes()
 
-        # Check if the attribute is in the source, but not the dest
-        for attr_name in src_attributes:
+        # Read every value once up front
+        src_vals = {attr_name: source.get_attribute_value(attr_name) for attr_name in src_attributes}
+        dest_vals = {attr_name: destination.get_attribute_value(attr_name) for attr_name in dest_attributes}
 
-            src_val = source.get_attribute_value(attr_name)
+        # Nothing changed (the common case). Same attribute names and values means neither loop would find anything.
+        if src_vals == dest_vals:
+            return (result, results)
 
-            if attr_name in dest_attributes:
+        # Split the attribute names up front, so each one is visited exactly once. The blueprint order is kept (rather
+        # than using set algebra) so the printed diff is stable from run to run.
+        common_names = [attr_name for attr_name in src_attributes if attr_name in dest_attributes]
+        new_names = [attr_name for attr_name in src_attributes if attr_name not in dest_attributes]
+        deleted_names = [attr_name for attr_name in dest_attributes if attr_name not in src_attributes]
 
-                # Diff the attributes here
-                dest_val = destination.get_attribute_value(attr_name)
+        # Attributes in both the source and the dest
+        for attr_name in common_names:
+            src_val = src_vals[attr_name]
+            dest_val = dest_vals[attr_name]
 
-                # The attribute values do not match!
-                if src_val != dest_val:
-                    # Mark the entire resource-to-resource diff as needing a rebuild
-                    if src_attributes[attr_name].modify_rebuild:
-                        result = StackzillaDiffResult.REBUILD_REQUIRED
-                    elif src_attributes[attr_name].dynamic:
-                        continue
-                    else:
-                        # Mark the resource-to-resource diff as CONFLICT, assuming the current diff result is not REBUILD.
-                        if result != StackzillaDiffResult.REBUILD_REQUIRED:
-                            result = StackzillaDiffResult.CONFLICT
+            # The attribute values match, nothing to do
+            if src_val == dest_val:
+                continue
 
-                    results[attr_name] = StackzillaAttributeDiff(src_attribute=src_attributes[attr_name],
-                                                                 dest_attribute=dest_attributes[attr_name],
-                                                                 result=StackzillaDiffResult.CONFLICT,
-                                                                 src_value=src_val,
-                                                                 dest_value=dest_val)
+            src_attribute = src_attributes[attr_name]
+            dest_attribute = dest_attributes[attr_name]
 
+            # Mark the entire resource-to-resource diff as needing a rebuild
+            if src_attribute.modify_rebuild or (src_attribute.dynamic and dest_attribute.modify_rebuild):
+                result = StackzillaDiffResult.REBUILD_REQUIRED
+            elif src_attribute.dynamic and dest_attribute.dynamic:
+                continue
             else:
                 # Mark the resource-to-resource diff as CONFLICT, assuming the current diff result is not REBUILD.
                 if result != StackzillaDiffResult.REBUILD_REQUIRED:
                     result = StackzillaDiffResult.CONFLICT
 
-                # This is a new attribute
-                results[attr_name] = StackzillaAttributeDiff(src_attribute=src_attributes[attr_name],
-                                                           dest_attribute=None,
-                                                           result=StackzillaDiffResult.NEW,
-                                                           src_value=src_val,
-                                                           dest_value=None)
-
-        # Check if the attribute is in the dest, but not the source
-        for attr_name in dest_attributes:
-
-            dest_val = destination.get_attribute_value(attr_name)
+            results[attr_name] = StackzillaAttributeDiff(src_attribute=src_attribute,
+                                                         dest_attribute=dest_attribute,
+                                                         result=StackzillaDiffResult.CONFLICT,
+                                                         src_value=src_val,
+                                                         dest_value=dest_val)
 
-            if attr_name in src_attributes:
-                # Only perform the diff if this attribute wasn't handled in the src_attributes loop above
-                if attr_name in results:
-                    continue
-
-                # Diff the attributes here
-                src_val = source.get_attribute_value(attr_name)
-
-                if src_val != dest_val:
+        # Attributes in the source, but not the dest
+        for attr_name in new_names:
+            # Mark the resource-to-resource diff as CONFLICT, assuming the current diff result is not REBUILD.
+            if result != StackzillaDiffResult.REBUILD_REQUIRED:
+                result = StackzillaDiffResult.CONFLICT
 
-                    # Mark the entire resource-to-resource diff as needing a rebuild
-                    if dest_attributes[attr_name].modify_rebuild:
-                        result = StackzillaDiffResult.REBUILD_REQUIRED
-                    elif dest_attributes[attr_name].dynamic:
-                        continue
-                    else:
-                        # Mark the resource-to-resource diff as CONFLICT, assuming the current diff result is not REBUILD.
-                        if result != StackzillaDiffResult.REBUILD_REQUIRED:
-                            result = StackzillaDiffResult.CONFLICT
-
-                    results[attr_name] = StackzillaAttributeDiff(src_attribute=src_attributes[attr_name],
-                                                               dest_attribute=dest_attributes[attr_name],
-                                                               result=StackzillaDiffResult.CONFLICT,
-                                                               src_value=src_val,
-                                                               dest_value=dest_val)
-            else:
-                # Mark the resource-to-resource diff as CONFLICT, assuming the current diff result is not REBUILD.
-                if result != StackzillaDiffResult.REBUILD_REQUIRED:
-                    result = StackzillaDiffResult.CONFLICT
+            # This is a new attribute
+            results[attr_name] = StackzillaAttributeDiff(src_attribute=src_attributes[attr_name],
+                                                         dest_attribute=None,
+                                                         result=StackzillaDiffResult.NEW,
+                                                         src_value=src_vals[attr_name],
+                                                         dest_value=None)
+
+        # Attributes in the dest, but not the source
+        for attr_name in deleted_names:
+            # Mark the resource-to-resource diff as CONFLICT, assuming the current diff result is not REBUILD.
+            if result != StackzillaDiffResult.REBUILD_REQUIRED:
+                result = StackzillaDiffResult.CONFLICT
 
-                # The attribute was deleted from the source
-                results[attr_name] = StackzillaAttributeDiff(src_attribute=None,
-                                                           dest_attribute=dest_attributes[attr_name],
-                                                           result=StackzillaDiffResult.DELETED,
-                                                           src_value=None,
-                                                           dest_value=dest_val)
+            # The attribute was deleted from the source
+            results[attr_name] = StackzillaAttributeDiff(src_attribute=None,
+                                                         dest_attribute=dest_attributes[attr_name],
+                                                         result=StackzillaDiffResult.DELETED,
+                                                         src_value=None,
+                                                         dest_value=dest_vals[attr_name])
 
         return (result, results)
 
@@ -619,4 +743,4 @@ class StackzillaDiff:
             resource.print(buffer)
 
         # Reset the color style
-        buffer.write(Style.RESET_ALL)
+        buffer.write(_RESET)
@@ -3,7 +3,7 @@ import typing
 from typing import List
 
 if typing.TYPE_CHECKING:
-    from stackzilla.diff.diff import AttributeModified
+    from stackzilla.resource import AttributeModified
 
 class VersionIncompatibility(Exception):
     """Raised when the major version of two resources do not match."""
@@ -14,4 +14,7 @@ def database():
     # Set this so that Stackzilla will use it for all DB operations
     StackzillaDB.db = memory_db
 
-    return memory_db
+    yield memory_db
+
+    # Release the shared in-memory database so the next test starts with a clean schema
+    memory_db.close()
@@ -195,3 +195,23 @@ def test_resource_diff_major_change():
 
     with pytest.raises(VersionIncompatibility):
         diff.compare_versions(source=src_obj, destination=dest_obj)
+
+def test_resource_diff_print():
+    """Verify the printed output for attribute additions, changes, and removals."""
+    src_obj = SourceResourceNew()
+    dest_obj = DestinationResource()
+    src_obj.attr_int = 88
+
+    diff = StackzillaDiff()
+    (_, diffs) = diff.compare_attributes(source=src_obj, destination=dest_obj)
+
+    output = ''.join(attribute_diff.render() for attribute_diff in diffs.values())
+    assert '@@\tattr_int: 42 => 88\n' in output
+    assert '++\tattr_new_int: <none> => 123\n' in output
+
+def test_apply_dispatch():
+    """Every diff result must have an apply handler."""
+    diff = StackzillaDiff()
+
+    # pylint: disable=protected-access
+    assert set(diff._apply_dispatch) == set(StackzillaDiffResult)
@@ -1,8 +1,9 @@
 """Module for all of the Stackzilla event system logic."""
 import inspect
+import types
 import typing
 import weakref
-from typing import Callable, List
+from typing import Callable, Dict, Hashable, List
 
 from stackzilla.events.exceptions import (HandlerException, HandlerNotFound,
                                           ParameterMissing,
@@ -14,9 +15,17 @@ if typing.TYPE_CHECKING:
 class StackzillaEvent:
     """The event class....duh."""
 
+    __slots__ = ('_handlers', '_index', '_next_token')
+
     def __init__(self) -> None:
-        """Default constructor. Sets up an empty list of handlers."""
-        self._handlers: List[weakref.WeakMethod] = []
+        """Default constructor. Sets up an empty table of handlers."""
+        # Weak references to the handlers, keyed by a token for each attachment, in the order they were attached
+        self._handlers: Dict[int, weakref.ref] = {}
+
+        # Maps the identity of each handler (see _handler_key()) to its attachment tokens, oldest first. This lets a
+        # handler be found (and detached) without resolving every weak reference in the table.
+        self._index: Dict[Hashable, List[int]] = {}
+        self._next_token = 0
 
     def attach(self, handler: Callable) -> None:
         """Attach a handler to this event.
@@ -26,18 +35,34 @@ class StackzillaEvent:
 
         Raises:
             UnsupportedHandlerType: Raised if an unsupported handler is passed in
+            ParameterMissing: Raised if the handler can not accept the sender keyword argument
         """
-        # Do not support classes as handlers
-        if inspect.isclass(handler):
-            raise UnsupportedHandlerType('Classes are not supported as handler types.')
-
-        if inspect.ismethod(handler):
-            ref = weakref.WeakMethod(handler)
-        elif callable(handler):
-            ref = weakref.ref(handler)
+        self._check_handler_type(handler)
+
+        if not self._accepts_sender(handler):
+            raise ParameterMissing('sender argument is missing from handler')
+
+        key = self._handler_key(handler)
+        token = self._next_token
+        self._next_token += 1
+
+        # Drop the attachment as soon as the handler goes away, before its id can be reused by another object
+        handlers, index = self._handlers, self._index
+        def _on_dead(_ref):
+            handlers.pop(token, None)
+            tokens = index.get(key)
+            if tokens is not None and token in tokens:
+                tokens.remove(token)
+                if not tokens:
+                    del index[key]
+
+        if isinstance(handler, types.MethodType):
+            ref = weakref.WeakMethod(handler, _on_dead)
         else:
-            raise UnsupportedHandlerType(f'{type(handler)} is not supported')
-        self._handlers.append(ref)
+            ref = weakref.ref(handler, _on_dead)
+
+        self._handlers[token] = ref
+        self._index.setdefault(key, []).append(token)
 
     def detatch(self, handler: Callable) -> None:
         """Detach a previously attached handler.
@@ -48,12 +73,15 @@ class StackzillaEvent:
         Raises:
             HandlerNotFound: Raised if the handler was not previously attached
         """
-        for ref in self._handlers:
-            if ref() == handler:
-                self._handlers.remove(ref)
-                return
+        key = self._handler_key(handler)
+        tokens = self._index.get(key)
+        if not tokens:
+            raise HandlerNotFound()
 
-        raise HandlerNotFound()
+        # Like list.remove(), the earliest attachment is the one detached
+        del self._handlers[tokens.pop(0)]
+        if not tokens:
+            del self._index[key]
 
     def invoke(self, sender: 'StackzillaResource', **kwargs):
         """Invoke any handlers.
@@ -61,19 +89,79 @@ class StackzillaEvent:
         Args:
             sender (StackzillaResource): The resource which is causing the event to be triggered.
         """
-        for ref in self._handlers:
+        # Most events never have anything attached, don't bother building the snapshot below
+        if not self._handlers:
+            return
 
-            # Test the weakref to ensure it isn't dead
+        # Iterate over a snapshot, since handlers can be detached (or collected) along the way
+        for ref in list(self._handlers.values()):
+
+            # Test the weakref to ensure it isn't dead. Dead handlers are removed by their weakref callback.
             resolved_ref = ref()
             if resolved_ref:
-
                 try:
                     resolved_ref(sender=sender, **kwargs)
-                except TypeError as err:
-                    if "got an unexpected keyword argument 'sender'" in str(err):
-                        raise ParameterMissing('sender argument is missing from handler') from err
                 except Exception as exc: # pylint: disable=broad-except
                     raise HandlerException(exc) from exc
-            else:
-                # The weakref is dead, remove this handler!
-                self._handlers.remove(ref)
+
+    @staticmethod
+    def _accepts_sender(handler: Callable) -> bool:
+        """Check if a handler can be called with the sender keyword argument.
+
+        Args:
+            handler (Callable): The handler to check
+
+        Returns:
+            bool: False if the handler's signature rules out a sender keyword argument
+        """
+        try:
+            parameters = inspect.signature(handler).parameters.values()
+        except (TypeError, ValueError):
+            # Some callables (builtins, for example) don't expose a signature. Give them the benefit of the doubt.
+            return True
+
+        for parameter in parameters:
+            if parameter.kind == inspect.Parameter.VAR_KEYWORD:
+                return True
+
+            if parameter.name == 'sender' and parameter.kind in (inspect.Parameter.POSITIONAL_OR_KEYWORD,
+                                                                 inspect.Parameter.KEYWORD_ONLY):
+                return True
+
+        return False
+
+    @staticmethod
+    def _check_handler_type(handler: Callable) -> None:
+        """Make sure a handler is a type that can be attached.
+
+        Args:
+            handler (Callable): The handler to check
+
+        Raises:
+            UnsupportedHandlerType: Raised if an unsupported handler is passed in
+        """
+        # Do not support classes as handlers
+        if isinstance(handler, type):
+            raise UnsupportedHandlerType('Classes are not supported as handler types.')
+
+        if not callable(handler):
+            raise UnsupportedHandlerType(f'{type(handler)} is not supported')
+
+    @staticmethod
+    def _handler_key(handler: Callable) -> Hashable:
+        """Fetch the key which identifies a handler in the index.
+
+        Handlers are identified by id() rather than their hash, so handlers that can't be hashed (such as the methods
+        of a dataclass) are supported. Bound methods are created on every attribute access, so they're identified by
+        their instance and function instead.
+
+        Args:
+            handler (Callable): The handler to identify
+
+        Returns:
+            Hashable: The key for the handler
+        """
+        if isinstance(handler, types.MethodType):
+            return (id(handler.__self__), id(handler.__func__))
+
+        return id(handler)
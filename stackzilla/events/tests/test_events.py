@@ -2,6 +2,7 @@
 import gc
 import typing
 from contextlib import contextmanager
+from dataclasses import dataclass
 from typing import Dict
 
 import pytest
@@ -193,7 +194,86 @@ def test_handler_missing_sender():
     """Pass in a handler that does not have all required arguments."""
     event = StackzillaEvent()
     resourceA = MockResource()
-    event.attach(resourceA.handler_no_sender)
 
+    # The handler is rejected when it's attached, rather than when the event is triggered
     with pytest.raises(ParameterMissing):
-        event.invoke(sender=None)
+        event.attach(resourceA.handler_no_sender)
+
+    event.invoke(sender=None)
+
+def test_handler_sender_kwargs():
+    """Handlers that take **kwargs can accept the sender."""
+    event = StackzillaEvent()
+    calls = []
+    handler = lambda **kwargs: calls.append(kwargs)
+    event.attach(handler=handler)
+
+    event.invoke(sender=None, foo='bar')
+    assert calls == [{'sender': None, 'foo': 'bar'}]
+
+def test_detach_repeated_attachment():
+    """A handler attached twice is called twice, and has to be detached twice."""
+    event = StackzillaEvent()
+    MockResource.global_call_count = 0
+    resourceA = MockResource()
+    event.attach(resourceA.handler)
+    event.attach(resourceA.handler)
+
+    event.invoke(sender=None)
+    assert MockResource.global_call_count == 2
+
+    event.detatch(resourceA.handler)
+    event.invoke(sender=None)
+    assert MockResource.global_call_count == 3
+
+    event.detatch(resourceA.handler)
+    with pytest.raises(HandlerNotFound):
+        event.detatch(resourceA.handler)
+
+def test_unhashable_handler():
+    """Methods of instances which can't be hashed (ex: dataclasses) can be attached and detached."""
+    @dataclass
+    class Handler:
+        calls: int = 0
+
+        def handler(self, sender):
+            self.calls += 1
+
+    event = StackzillaEvent()
+    handler = Handler()
+    event.attach(handler.handler)
+    event.invoke(sender=None)
+    assert handler.calls == 1
+
+    event.detatch(handler.handler)
+    event.invoke(sender=None)
+    assert handler.calls == 1
+
+def test_interleaved_attachments():
+    """Handlers are called in the order they were attached, even when one is attached more than once."""
+    event = StackzillaEvent()
+    calls = []
+    handler_a = lambda sender: calls.append('a')
+    handler_b = lambda sender: calls.append('b')
+    for handler in [handler_a, handler_b, handler_a]:
+        event.attach(handler)
+
+    event.invoke(sender=None)
+    assert calls == ['a', 'b', 'a']
+
+    # The earliest attachment is the one that's detached
+    calls.clear()
+    event.detatch(handler_a)
+    event.invoke(sender=None)
+    assert calls == ['b', 'a']
+
+def test_collected_handler_is_forgotten():
+    """A handler that's garbage collected is dropped right away, so its id can't be mistaken for a new handler's."""
+    event = StackzillaEvent()
+    with garbage_cleanup():
+        resource = MockResource()
+        event.attach(resource.handler)
+        del resource
+
+    assert not event._handlers
+    assert not event._index
@@ -1,6 +1,6 @@
 """Module for graph resolution functionality."""
 from dataclasses import dataclass
-from typing import Dict, List, Type
+from typing import Any, Callable, Dict, List, Optional, Set, Type
 
 from stackzilla.graph.exceptions import CircularDependency
 from stackzilla.logger.core import CoreLogger
@@ -10,8 +10,10 @@ from stackzilla.logger.core import CoreLogger
 class Node:
     """Represents a single node within the graph."""
 
+    __slots__ = ('obj', 'dependencies')
+
     obj: Type[object]
-    dependencies: List[Type[object]]
+    dependencies: Set[Type[object]]
 
     def has_dependencies(self):
         """Test if the node has any dependencies."""
@@ -25,6 +27,9 @@ class Graph:
         # Dictionary of all the graph nodes. Each entry is indexed by the
         # id() of the Node.obj (which is an int)
         self._nodes: Dict[int, Node] = {}
+
+        # Reverse index of the nodes that depend on each node, built by resolve() and reset whenever a node is added
+        self._dependents: Optional[Dict[int, List[int]]] = None
         self._logger = CoreLogger(component='graph')
 
     def add_node(self, obj: Type[object], dependencies: List[Type[object]]):
@@ -35,14 +40,41 @@ class Graph:
             dependencies (List[Type[object]]): A list of classes that obj depends on.
         """
         self._logger.debug(f'Adding node {id(obj)}')
-        self._nodes[id(obj)] = Node(obj=obj, dependencies=dependencies)
+        self._nodes[id(obj)] = Node(obj=obj, dependencies=set(dependencies))
+        self._dependents = None
+
+    def dependencies(self) -> Dict[Type[object], List[Type[object]]]:
+        """Fetch the dependencies of every node in the graph.
+
+        Returns:
+            Dict[Type[object], List[Type[object]]]: The classes each class in the graph depends on
+        """
+        return {node.obj: list(node.dependencies) for node in self._nodes.values()}
+
+    def _build_dependents(self) -> Dict[int, List[int]]:
+        """Build (or reuse) the reverse index of the nodes that depend on each node.
+
+        Returns:
+            Dict[int, List[int]]: The id() of each node's dependents, indexed by the id() of the node
+        """
+        if self._dependents is None:
+            dependents: Dict[int, List[int]] = {key: [] for key in self._nodes}
+            for key, node in self._nodes.items():
+                for dependency in node.dependencies:
+                    dependents.setdefault(id(dependency), []).append(key)
 
+            self._dependents = dependents
 
-    def resolve(self, reverse: bool = False) -> List[List[Type[object]]]:
+        return self._dependents
+
+    def resolve(self, reverse: bool = False,
+                sort_key: Optional[Callable[[Type[object]], Any]] = None) -> List[List[Type[object]]]:
         """Resolve the graph into phases.
 
         Args:
             reverse (bool, optional): If True, resolve the graph in reverse order. Defaults to False.
+            sort_key (Optional[Callable], optional): Key used to sort the objects within each phase. Defaults to None,
+                which keeps the order the objects were added to the graph.
 
         Raises:
             CircularDependency: Raised if a circular dependency is detected.
@@ -55,53 +87,49 @@ class Graph:
         # Objects within a phase do not depend on each other.
         phases: List[List[object]] = []
 
-        # Create a copy of the nodes dictionary since we'll be removing entries from it
-        nodes: Dict[int, Node] = self._nodes.copy()
-
-        # List of objects for the current phase
-        current_phase: List[Type[object]] = []
+        # The number of unresolved dependencies for each node, and the nodes that depend on each node. Each node
+        # (and each dependency edge) is only visited once, rather than rescanning the whole graph every phase.
+        # Only the counters are per-resolve, the nodes themselves are never modified.
+        remaining: Dict[int, int] = {key: len(node.dependencies) for key, node in self._nodes.items()}
+        dependents = self._build_dependents()
 
-        # Work until there's nothing left to do!
-        while nodes:
-
-            # Flag that indicates if nodes were deleted on the current pass
-            nodes_deleted = False
+        # Used to keep the nodes of each phase in the order they were added to the graph
+        order: Dict[int, int] = {key: index for index, key in enumerate(self._nodes)}
 
-            # Walk through all of the nodes in the graph, looking for entries with no dependencies
-            for node in nodes.values():
+        # The nodes for the current phase, starting with the ones that have no dependencies
+        current_phase: List[int] = [key for key, count in remaining.items() if count == 0]
 
-                # If this node has no dependencies, add it to the current phase.
-                if node.has_dependencies() is False:
-                    current_phase.append(node.obj)
-
-            # Go back and remove all of the nodes from the current phase
-            for node in current_phase:
-                nodes_deleted = True
+        # Work until there's nothing left to do!
+        while current_phase:
+            phase = [self._nodes[key].obj for key in current_phase]
+            if sort_key:
+                phase.sort(key=sort_key)
 
-                # Remove this node from the graph to ensure it isn't considered for future phases
-                del nodes[id(node)]
+            phases.append(phase)
 
-            # Re-walk the remaining nodes in the graph to remove dependencies
-            for dependent_node in nodes.values():
+            # Remove the current phase from the graph, collecting the nodes that no longer have any dependencies
+            next_phase: List[int] = []
+            for key in current_phase:
+                del remaining[key]
 
-                # For all of the nodes in the current phase, remove them as dependencies
-                for node in current_phase:
-                    if node in dependent_node.dependencies:
-                        dependent_node.dependencies.remove(node)
+                for dependent in dependents[key]:
+                    remaining[dependent] -= 1
+                    if remaining[dependent] == 0:
+                        next_phase.append(dependent)
 
-            # Ruh-roh! If no nodes were deleted, that means a circular dependency was encountered
-            if nodes_deleted is False and nodes:
+            current_phase = sorted(next_phase, key=order.__getitem__)
 
-                error = CircularDependency()
+        # Ruh-roh! If any nodes are left, that means a circular dependency was encountered
+        if remaining:
+            resolved = {obj for phase in phases for obj in phase}
 
-                for node in nodes.values():
-                    error.nodes.append(node)
+            error = CircularDependency()
 
-                raise error
+            for key in remaining:
+                node = self._nodes[key]
+                error.nodes.append(Node(obj=node.obj, dependencies=node.dependencies - resolved))
 
-            # Add the current phase to the list of phases and empty the phase list to prepare for the next one
-            phases.append(current_phase)
-            current_phase = []
+            raise error
 
         # Does the caller want to see the graph in reverse?
         if reverse:
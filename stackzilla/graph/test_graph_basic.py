@@ -103,3 +103,48 @@ def test_phase_reversal():
     assert result[0][0] == Alpha
     assert result[1][0] == Beta
     assert result[2][0] == Charlie
+
+def test_dependencies():
+    """Verify the dependencies are reported, and left intact by resolve()."""
+    graph = Graph()
+    graph.add_node(obj=Alpha, dependencies=[Beta])
+    graph.add_node(obj=Beta, dependencies=[Charlie])
+    graph.add_node(obj=Charlie, dependencies=[])
+
+    expected = {Alpha: [Beta], Beta: [Charlie], Charlie: []}
+    assert graph.dependencies() == expected
+
+    # Resolving the graph (more than once) must not consume the dependencies
+    assert graph.resolve() == graph.resolve()
+    assert graph.dependencies() == expected
+
+def test_shared_dependency():
+    """Verify that a node depending on multiple phases lands after the latest one."""
+    graph = Graph()
+    graph.add_node(obj=Alpha, dependencies=[Beta, Charlie])
+    graph.add_node(obj=Beta, dependencies=[Charlie])
+    graph.add_node(obj=Charlie, dependencies=[])
+
+    assert graph.resolve() == [[Charlie], [Beta], [Alpha]]
+
+def test_unknown_dependency():
+    """A dependency that was never added to the graph can not be resolved."""
+    graph = Graph()
+    graph.add_node(obj=Alpha, dependencies=[])
+    graph.add_node(obj=Beta, dependencies=[Charlie])
+
+    with pytest.raises(CircularDependency) as exc:
+        graph.resolve()
+
+    assert [node.obj for node in exc.value.nodes] == [Beta]
+    assert exc.value.nodes[0].dependencies == {Charlie}
+
+def test_phase_sort_key():
+    """Verify the objects within each phase can be sorted."""
+    graph = Graph()
+    graph.add_node(obj=Charlie, dependencies=[])
+    graph.add_node(obj=Beta, dependencies=[])
+    graph.add_node(obj=Alpha, dependencies=[])
+
+    assert graph.resolve() == [[Charlie, Beta, Alpha]]
+    assert graph.resolve(sort_key=lambda obj: obj.__qualname__) == [[Alpha, Beta, Charlie]]
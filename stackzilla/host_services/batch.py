@@ -0,0 +1,42 @@
+"""Helper for running a batch of per-item commands on a remote host in a single round trip."""
+import shlex
+from typing import List, Tuple, Type
+
+from stackzilla.logger.core import CoreLogger
+from stackzilla.utils.ssh import SSHClient
+
+# Printed before each item's command in a batch, to find the item that failed
+_BATCH_MARKER = '##ITEM:'
+
+def run_batch(client: SSHClient, logger: CoreLogger, commands: List[Tuple[str, str]], error: Type[Exception],
+              sudo: bool = False) -> None:
+    """Run a list of commands on the remote host, in a single round trip.
+
+    The commands are chained with '&&', so they run in order and stop at the first failure. Any commands before
+    the failure will have already been applied, just as if they had been run one at a time. Each command is
+    preceded by a marker on STDOUT, so the last marker identifies the item that failed.
+
+    Args:
+        client (SSHClient): The client connected to the remote host
+        logger (CoreLogger): Logger to report a failure with
+        commands (List[Tuple[str, str]]): The item name (ex: a user or group name) and command for each item
+        error (Type[Exception]): The exception to raise (with the failing command's STDERR) on failure
+        sudo (bool, optional): Run the whole batch with elevated privileges. Defaults to False.
+    """
+    if not commands:
+        return
+
+    command = ' && '.join(f'echo {shlex.quote(_BATCH_MARKER + name)} && {cmd}' for name, cmd in commands)
+    output = client.run_command(command=command, sudo=sudo)
+
+    if output.exit_code:
+        failed_item = None
+        for line in output.stdout.splitlines():
+            if line.startswith(_BATCH_MARKER):
+                failed_item = line[len(_BATCH_MARKER):]
+
+        if failed_item is None:
+            raise error(output.stderr)
+
+        logger.critical(f'Command failed for {failed_item}')
+        raise error(f'{failed_item}: {output.stderr}')
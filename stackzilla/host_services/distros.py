@@ -0,0 +1,5 @@
+"""Linux distributions supported by the host services."""
+
+# Values of the "ID" field in /etc/os-release for every supported distro
+KNOWN_DISTROS = frozenset({'alpine', 'amzn', 'centos', 'debian', 'fedora', 'gentoo', 'opensuse-leap', 'rhel',
+                           'slackware', 'ubuntu'})
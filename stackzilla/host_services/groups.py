@@ -1,18 +1,64 @@
 """Functionality for creating and managing groups on a remote system."""
+import shlex
 from dataclasses import dataclass
-from typing import List
+from logging import DEBUG
+from typing import List, Tuple, Type
 
+from stackzilla.host_services.batch import run_batch
+from stackzilla.host_services.distros import KNOWN_DISTROS
 from stackzilla.host_services.exceptions import UnsupportedPlatform
 from stackzilla.logger.core import CoreLogger
 from stackzilla.utils.ssh import SSHClient
 
 
-@dataclass
+@dataclass(init=False)
 class HostGroup:
     """Simple model which represents a host group."""
 
+    # dataclass(slots=True) needs Python 3.10, so the slots (and the defaults, in __init__) are declared by hand
+    __slots__ = ('name', 'id')
+
     name: str
-    id: int = None # pylint: disable=invalid-name
+    id: int # pylint: disable=invalid-name
+
+    def __init__(self, name: str, id: int = None) -> None: # pylint: disable=invalid-name,redefined-builtin
+        """Default constructor."""
+        self.name = name
+        self.id = id # pylint: disable=invalid-name
+
+    def __setstate__(self, state) -> None:
+        """Restore a pickled group, including groups pickled before the model had slots."""
+        # Slotted objects pickle as (None, slot values), older pickles are just the instance dict
+        for name, value in (state[1] if isinstance(state, tuple) else state).items():
+            setattr(self, name, value)
+
+# Group creation commands for each supported distro: (with a group id, without a group id)
+_GROUPADD_COMMANDS = {
+    'alpine': ('addgroup -g {id} {name}', 'addgroup {name}'),
+    'amzn': ('groupadd --gid {id} {name}', 'groupadd {name}'),
+    'centos': ('groupadd --gid {id} {name}', 'groupadd {name}'),
+    'debian': ('groupadd --gid {id} {name}', 'groupadd {name}'),
+    'fedora': ('groupadd --gid {id} {name}', 'groupadd {name}'),
+    'gentoo': ('groupadd --gid {id} {name}', 'groupadd {name}'),
+    'opensuse-leap': ('groupadd --gid {id} {name}', 'groupadd {name}'),
+    'rhel': ('groupadd --gid {id} {name}', 'groupadd {name}'),
+    'slackware': ('groupadd --gid {id} {name}', 'groupadd {name}'),
+    'ubuntu': ('addgroup --gid {id} {name}', 'addgroup {name}'),
+}
+
+# Group deletion command for each supported distro
+_GROUPDEL_COMMANDS = {
+    'alpine': 'delgroup {name}',
+    'amzn': 'groupdel {name}',
+    'centos': 'groupdel {name}',
+    'debian': 'groupdel {name}',
+    'fedora': 'groupdel {name}',
+    'gentoo': 'groupdel {name}',
+    'opensuse-leap': 'groupdel {name}',
+    'rhel': 'groupdel {name}',
+    'slackware': 'groupdel {name}',
+    'ubuntu': 'delgroup {name}',
+}
 
 class GroupCreateFailure(Exception):
     """Raised when the group creation process fails."""
@@ -29,7 +75,9 @@ class GroupManagement:
         self._distro: str = distro
         self._logger: CoreLogger = CoreLogger(component='group-mgmt')
 
-    # pylint: disable=too-many-branches
+        if distro not in KNOWN_DISTROS:
+            self._logger.debug('Unsupported platform, group operations will fail', extra={'distro': distro})
+
     def create_groups(self, groups: List[HostGroup]):
         """Create groups on the remote host.
 
@@ -38,67 +86,49 @@ class GroupManagement:
 
         Raises:
             GroupCreateFailure: Raised if any of the create operations fails
+            UnsupportedPlatform: Raised if the distro is not supported
         """
-        if self._distro == 'amzn':
-            base_cmd = 'groupadd'
-            for group in groups:
-                if group.id:
-                    cmd = f'{base_cmd} --gid {group.id} {group.name}'
-                else:
-                    cmd = f'{base_cmd} {group.name}'
-
-                self._logger.debug(f'Creating group: {cmd}')
-                output = self._client.run_command(command=cmd, sudo=True)
-
-                if output.exit_code:
-                    raise GroupCreateFailure(output.stderr)
-
-        else:
-            # These distros have differences in the group id command
-            for group in groups:
-                if group.id:
-                    if self._distro == 'alpline':
-                        cmd = f'addgroup -g {group.id} {group.name}'
-                    elif self._distro in ['centos', 'debian', 'fedora', 'gentoo', 'opensuse-leap', 'rhel', 'slackware']:
-                        cmd = f'groupadd --gid {group.id} {group.name}'
-                    elif self._distro == 'ubuntu':
-                        cmd = f'addgroup --gid {group.id} {group.name}'
-                    else:
-                        self._logger.critical('Unsupported platform detected in create_groups', extra={'distro': self._distro})
-                        raise UnsupportedPlatform(self._distro)
-                else:
-                    if self._distro in['alpine', 'ubuntu']:
-                        cmd = f'addgroup {group.name}'
-                    elif self._distro in ['centos', 'debian', 'fedora', 'gentoo', 'opensuse-leap', 'rhel', 'slackware']:
-                        cmd = f'groupadd {group.name}'
-                    else:
-                        self._logger.critical('Unsupported platform detected in create_groups', extra={'distro': self._distro})
-                        raise UnsupportedPlatform(self._distro)
-
-                self._logger.debug(f'Creating new group {group.name}')
-                output = self._client.run_command(command=cmd, sudo=True)
-
-                if output.exit_code:
-                    raise GroupCreateFailure(output.stderr)
+        commands = _GROUPADD_COMMANDS.get(self._distro)
+        if commands is None:
+            self._logger.critical('Unsupported platform detected in create_groups', extra={'distro': self._distro})
+            raise UnsupportedPlatform(self._distro)
+
+        gid_cmd, cmd = commands
+        group_commands: List[Tuple[str, str]] = []
+        for group in groups:
+            name = shlex.quote(group.name)
+            if group.id:
+                group_commands.append((group.name, gid_cmd.format(id=shlex.quote(str(group.id)), name=name)))
+            else:
+                group_commands.append((group.name, cmd.format(name=name)))
+
+        self._run_batch(group_commands, GroupCreateFailure)
 
     def delete_groups(self, groups: List[HostGroup]):
         """Delete the specified groups on the remote host.
 
         Args:
             groups (List[HostGroup]): The groups to delete
+
+        Raises:
+            GroupDeleteFailure: Raised if any of the delete operations fails
+            UnsupportedPlatform: Raised if the distro is not supported
         """
-        for group in groups:
+        cmd = _GROUPDEL_COMMANDS.get(self._distro)
+        if cmd is None:
+            self._logger.critical('Unsupported platform detected in delete_groups', extra={'distro': self._distro})
+            raise UnsupportedPlatform(self._distro)
 
-            if self._distro in ['alpline', 'ubuntu']:
-                cmd = f'delgroup {group.name}'
-            elif self._distro in ['amzn', 'centos', 'debian', 'fedora', 'gentoo', 'opensuse-leap', 'rhel', 'slackware']:
-                cmd = f'groupdel {group.name}'
-            else:
-                self._logger.critical('Unsupported platform detected in delete_groups', extra={'distro': self._distro})
-                raise UnsupportedPlatform(self._distro)
+        self._run_batch([(group.name, cmd.format(name=shlex.quote(group.name))) for group in groups], GroupDeleteFailure)
 
-            self._logger.debug(message=f'Deleting group: {group.name}')
-            output = self._client.run_command(command=cmd, sudo=True)
+    def _run_batch(self, commands: List[Tuple[str, str]], error: Type[Exception]):
+        """Run a list of group commands on the remote host, in a single round trip.
+
+        Args:
+            commands (List[Tuple[str, str]]): The group name and command for each group
+            error (Type[Exception]): The exception to raise (with the failing command's STDERR) on failure
+        """
+        if commands and self._logger.is_enabled_for(DEBUG):
+            self._logger.debug(f'Running group command(s): {[cmd for _, cmd in commands]}')
 
-            if output.exit_code:
-                raise GroupDeleteFailure(output.stderr)
+        run_batch(client=self._client, logger=self._logger, commands=commands, error=error, sudo=True)
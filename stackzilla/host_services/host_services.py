@@ -1,13 +1,15 @@
 """Interface for the Host Services functionality."""
 import re
+import shlex
 from enum import Enum, auto
-from typing import List
+from logging import DEBUG
+from typing import Dict, List
 
 from stackzilla.host_services.groups import GroupManagement, HostGroup
 from stackzilla.host_services.package_managers.base import PackageManager
 from stackzilla.host_services.users import HostUser, UserManagement
 from stackzilla.logger.core import CoreLogger
-from stackzilla.utils.ssh import SSHClient
+from stackzilla.utils.ssh import CmdResult, SSHClient
 
 
 # pylint: disable=invalid-name
@@ -17,6 +19,26 @@ class ServiceManagerType(Enum):
     service = auto()
     systemctl = auto()
 
+# Pattern for the CentOS fallback version check in HostServices._get_os_version()
+_CENTOS_VERSION_RE = re.compile(r'CentOS Linux release ([0-9]+\.[0-9+])"')
+
+# Wraps the output of each command run by HostServices._run_fact_commands()
+_FACT_MARKER = '##FACT:'
+
+# Command templates for each service manager, keyed by the operation
+_SERVICE_COMMANDS = {
+    ServiceManagerType.service: {
+        'restart': 'service {service} restart',
+        'start': 'service {service} start',
+        'stop': 'service {service} stop',
+    },
+    ServiceManagerType.systemctl: {
+        'restart': 'systemctl restart {service}',
+        'start': 'systemctl enable --now {service}',
+        'stop': 'systemctl disable --now {service}',
+    },
+}
+
 class HostServicesError(Exception):
     """Raised when a host services operation fails."""
 
@@ -38,6 +60,10 @@ class HostServices:
         # Gather information about the host system.
         self._query_system_facts()
 
+        # The distro is known now, the group and user managers can be reused for every operation
+        self._group_mgmt = GroupManagement(ssh_client=self._client, distro=self._linux_distro)
+        self._user_mgmt = UserManagement(ssh_client=self._client, distro=self._linux_distro)
+
     @property
     def os_name(self) -> str:
         """Get the OS string."""
@@ -70,23 +96,19 @@ class HostServices:
 
     def create_users(self, users: List[HostUser]) -> None:
         """Create users on the remote host."""
-        user_mgmt = UserManagement(self._client, self.linux_distro)
-        user_mgmt.create_users(users=users)
+        self._user_mgmt.create_users(users=users)
 
     def delete_users(self, users: List[HostUser]) -> None:
         """Delete users on the remote host."""
-        user_mgmt = UserManagement(ssh_client=self._client, distro=self.linux_distro)
-        user_mgmt.delete_users(users=users)
+        self._user_mgmt.delete_users(users=users)
 
     def create_groups(self, groups: List[HostGroup]) -> None:
         """Create groups on the remote host."""
-        group_mgmt = GroupManagement(ssh_client=self._client, distro=self.linux_distro)
-        group_mgmt.create_groups(groups=groups)
+        self._group_mgmt.create_groups(groups=groups)
 
     def delete_groups(self, groups: List[HostGroup]) -> None:
         """Delete gropus on the remote host."""
-        group_mgmt = GroupManagement(ssh_client=self._client, distro=self.linux_distro)
-        group_mgmt.delete_groups(groups=groups)
+        self._group_mgmt.delete_groups(groups=groups)
 
     def add_authorized_ssh_key(self, user: str, key: str) -> None:
         """Add a new SSH key to the list of authorized keys.
@@ -95,7 +117,9 @@ class HostServices:
             user (str): Name of the user the key is being added for
             key (str): The public portion of the SSH key
         """
-        output = self._client.run_command(command=f'echo "{key}" >> /home/{user}/.ssh.authorized_keys')
+        ssh_dir = f'/home/{shlex.quote(user)}/.ssh'
+        output = self._client.run_command(
+            command=f"mkdir -p {ssh_dir} && printf '%s\\n' {shlex.quote(key)} >> {ssh_dir}/authorized_keys")
         if output.exit_code:
             raise HostServicesError(output.stderr)
 
@@ -106,7 +130,14 @@ class HostServices:
             user (str): The user to delete the key for
             key (str): The public portion of the SSH key
         """
-        output = self._client.run_command(command=f'sed -i "\\:{key}:d" /home/{user}/.ssh/authorized_keys')
+        # grep -F matches the key literally, so characters such as '/' and '+' (common in keys) need no escaping.
+        # grep exits with 1 when no lines are left over, which is still a success. The filtered copy is written back
+        # with cat, rather than mv, to preserve the permissions on authorized_keys.
+        keys_file = f'/home/{shlex.quote(user)}/.ssh/authorized_keys'
+        output = self._client.run_command(
+            command=f'grep -vF -- {shlex.quote(key)} {keys_file} > {keys_file}.tmp; '
+                    f'if [ $? -le 1 ]; then cat {keys_file}.tmp > {keys_file}; rc=$?; else rc=1; fi; '
+                    f'rm -f {keys_file}.tmp; exit $rc')
         if output.exit_code:
             raise HostServicesError(output.stderr)
 
@@ -120,16 +151,7 @@ class HostServices:
             RuntimeError: Raised if an unsupported service manager is encountered
             HostServicesError: Raised if the operation fails
         """
-        if self._service_manager == ServiceManagerType.service:
-            cmd = f'service {service} restart'
-        elif self._service_manager == ServiceManagerType.systemctl:
-            cmd = f'systemctl restart {service}'
-        else:
-            raise RuntimeError('Unsupported service manager encountered.')
-
-        output= self._client.run_command(command=cmd, sudo=True)
-        if output.exit_code:
-            raise HostServicesError(output.stderr)
+        self._run_service_command(operation='restart', service=service)
 
     def start_service(self, service: str) -> None:
         """Start/enable a service using the configured service manager.
@@ -141,16 +163,7 @@ class HostServices:
             RuntimeError: Raised if an unsupported service manager is encountered
             HostServicesError: Raised if the operation fails
         """
-        if self._service_manager == ServiceManagerType.service:
-            cmd = f'service {service} start'
-        elif self._service_manager == ServiceManagerType.systemctl:
-            cmd = f'systemctl enable --now {service}'
-        else:
-            raise RuntimeError('Unsupported service manager encountered.')
-
-        output = self._client.run_command(command=cmd, sudo=True)
-        if output.exit_code:
-            raise HostServicesError(output.stderr)
+        self._run_service_command(operation='start', service=service)
 
     def stop_service(self, service: str) -> None:
         """Stop/disable a service using the configured service manager.
@@ -162,14 +175,24 @@ class HostServices:
             RuntimeError: Raised if an unsupported service manager is encountered
             HostServicesError: Raised if the operation fails
         """
-        if self._service_manager == ServiceManagerType.service:
-            cmd = f'service {service} stop'
-        elif self._service_manager == ServiceManagerType.systemctl:
-            cmd = f'systemctl disable --now {service}'
-        else:
+        self._run_service_command(operation='stop', service=service)
+
+    def _run_service_command(self, operation: str, service: str) -> None:
+        """Run a service operation using the configured service manager.
+
+        Args:
+            operation (str): One of 'restart', 'start', or 'stop'
+            service (str): Name of the service to operate on
+
+        Raises:
+            RuntimeError: Raised if an unsupported service manager is encountered
+            HostServicesError: Raised if the operation fails
+        """
+        commands = _SERVICE_COMMANDS.get(self._service_manager)
+        if commands is None:
             raise RuntimeError('Unsupported service manager encountered.')
 
-        output = self._client.run_command(command=cmd, sudo=True)
+        output = self._client.run_command(command=commands[operation].format(service=service), sudo=True)
         if output.exit_code:
             raise HostServicesError(output.stderr)
 
@@ -177,8 +200,21 @@ class HostServices:
         """Determine the remote OS type, package manager, and other details."""
         self._logger.debug(f'Starting host services fact check for {self._client.host}')
 
+        # None of the fact checks depend on each other, so they're all sent to the host in a single round trip
+        service_managers = [ServiceManagerType.service, ServiceManagerType.systemctl]
+
+        commands = {
+            'uname': 'uname',
+            'os-release': 'cat /etc/os-release',
+            'pkg': PackageManager.detect_command(),
+        }
+        for mgr in service_managers:
+            commands[f'svc-{mgr.name}'] = f'which {mgr.name}'
+
+        results = self._run_fact_commands(commands)
+
         # First thing first - determine if this is a POSIX-based operating system
-        output = self._client.run_command(command='uname')
+        output = results['uname']
         if output.exit_code == 0:
             self._is_posix = True
             self._logger.debug(f'uname output: {output.stderr} | Uname exit-code {output.exit_code}')
@@ -191,77 +227,140 @@ class HostServices:
         self._os = output.stdout.strip()
 
         # Now it's time to determine the distribution that is installated.
-        output = self._client.run_command(command='cat /etc/os-release')
+        os_release = self._parse_os_release(output=results['os-release'])
 
-        if output.exit_code == 0:
+        # Determine which package managers are present
+        self._parse_package_managers(output=results['pkg'])
+
+        # Run a secondary os version check if one wasn't found in /etc/os-release
+        if not self._os_version:
+            self._get_os_version(os_release=os_release)
+
+        # Determine which service manager is installed
+        self._parse_service_managers(results=results, service_managers=service_managers)
+
+    def _parse_os_release(self, output: CmdResult) -> Dict[str, str]:
+        """Determine the distro and its version from the contents of /etc/os-release.
+
+        Args:
+            output (CmdResult): The results of reading /etc/os-release
+
+        Returns:
+            Dict[str, str]: The fields in the file, empty if it couldn't be read
+        """
+        os_release: Dict[str, str] = {}
+        if output.exit_code:
+            self._logger.debug('/etc/os-release file was not found')
+            return os_release
+
+        if self._logger.is_enabled_for(DEBUG):
             self._logger.debug(f'Contents of /etc/os-release: {output.stdout}')
 
-            # There is a line that starts with "ID=" which has the distro name.
-            matches = re.findall(r'^ID=(.*)$', output.stdout, re.MULTILINE)
-            if matches:
-                self._linux_distro = matches[0].strip()
+        # The file is a list of KEY=value lines. "ID" has the distro name, and "VERSION_ID" (if present) has the
+        # distro version. Only the first occurrence of each key is used.
+        for line in output.stdout.splitlines():
+            key, sep, value = line.partition('=')
+            if sep:
+                # Remove any quotes around the value
+                os_release.setdefault(key, value.strip().strip('"'))
 
-                # Remove any quotes around the distro name
-                self._linux_distro = self._linux_distro.strip('"')
+        distro = os_release.get('ID')
+        version = os_release.get('VERSION_ID')
 
-                self._logger.debug(f'Distro found: {self._linux_distro}')
+        if distro is not None:
+            self._linux_distro = distro
+            self._logger.debug(f'Distro found: {self._linux_distro}')
 
-            # if "VERSION_ID" is in the output, that is the distro version
-            matches = re.findall(r'VERSION_ID=(.*)$', output.stdout, re.MULTILINE)
-            if matches:
-                self._os_version = matches[0].strip()
+        if version is not None:
+            self._os_version = version
+            self._logger.debug(f'Distro version found: {self._os_version}')
 
-                # Remove any quotes around the version
-                self._os_version = self._os_version.strip('"')
+        return os_release
 
-                self._logger.debug(f'Distro version found: {self._os_version}')
-        else:
-            self._logger.debug('/etc/os-release file was not found')
+    def _parse_package_managers(self, output: CmdResult) -> None:
+        """Save off the package managers found by PackageManager.detect_command().
 
-        # Determine which package managers are present
-        for mgr in PackageManager.suppported_managers():
-            if mgr.exists(ssh_client=self._client):
-                self._package_managers.append(mgr(self._client))
+        Args:
+            output (CmdResult): The results of the package manager probe
+        """
+        for mgr in PackageManager.parse_detect_output(output.stdout):
+            self._package_managers.append(mgr(self._client))
 
-        # Run a secondary os version check if one wasn't found in /etc/os-release
-        if self._os_version is None:
-            self._get_os_version()
+    def _parse_service_managers(self, results: Dict[str, CmdResult], service_managers: List[ServiceManagerType]) -> None:
+        """Save off the service manager to use. The first one found, wins.
 
-        # Determine which service manager is installed. The first one found, wins.
-        for mgr in [ServiceManagerType.service, ServiceManagerType.systemctl]:
-            output = self._client.run_command(command=f'which {mgr.name}')
-            if output.exit_code == 0:
+        Args:
+            results (Dict[str, CmdResult]): The fact check results, which include a "svc-<name>" probe for each manager
+            service_managers (List[ServiceManagerType]): The service managers, in order of preference
+        """
+        for mgr in service_managers:
+            if results[f'svc-{mgr.name}'].exit_code == 0:
                 self._service_manager = mgr
                 break
 
-    def _get_os_version(self):
-        """Fetch the operating system version."""
+    def _run_fact_commands(self, commands: Dict[str, str]) -> Dict[str, CmdResult]:
+        """Run a set of independent commands on the host, in a single round trip.
+
+        Each command's output is wrapped in marker lines (the closing marker carries the exit code), so the combined
+        STDOUT can be split back up per command. The commands' STDERR can't be told apart, and isn't returned.
+
+        Args:
+            commands (Dict[str, str]): The commands to run, keyed by a name for the results
+
+        Returns:
+            Dict[str, CmdResult]: The results keyed by the same names. A command which didn't report back (for example,
+                because the remote shell isn't POSIX) is given a non-zero exit code.
+        """
+        script = '; '.join(f'echo "{_FACT_MARKER}{key}"; {command}; echo "{_FACT_MARKER}{key}:$?"'
+                           for key, command in commands.items())
+        output = self._client.run_command(command=script)
+
+        results = {key: CmdResult(stdout='', exit_code=1) for key in commands}
+        current = None
+        lines: List[str] = []
+        for line in output.stdout.splitlines():
+            # If a command's output doesn't end with a newline, its closing marker ends up on the same line
+            marker = line.find(_FACT_MARKER)
+            if marker == -1:
+                if current is not None:
+                    lines.append(line)
+                continue
+
+            if marker and current is not None:
+                lines.append(line[:marker])
+            line = line[marker:]
+
+            # Opening markers are just the key. A command whose closing marker went missing is left as a failure.
+            key, sep, exit_code = line[len(_FACT_MARKER):].partition(':')
+            if not sep:
+                current = key
+                lines = []
+            elif key == current and exit_code.isdigit():
+                results[key] = CmdResult(stdout=''.join(f'{text}\n' for text in lines), exit_code=int(exit_code))
+                current = None
+
+        return results
+
+    def _get_os_version(self, os_release: Dict[str, str]):
+        """Fetch the operating system version.
+
+        Args:
+            os_release (Dict[str, str]): The /etc/os-release fields, which were already read during the fact check
+        """
+        # Nothing to do (and no extra round trip for CentOS) if VERSION_ID was already found
+        if self._os_version:
+            return
+
         if self._linux_distro == "amzn":
             # Amazon Linux stores the version in /etc/os-release.
-            output = self._client.run_command(command='cat /etc/os-release')
-
-            if output.exit_code == 0:
-                match = re.search(r'VERSION=\"([0-9]+)\"', output.stdout)
-                if match:
-                    self._os_version = match.group(1)
+            version = os_release.get('VERSION', '')
+            if version.isdigit():
+                self._os_version = version
 
         elif self._linux_distro == "centos":
             # Centos stores its version information in /etc/centos-release
             output = self._client.run_command(command='cat /etc/centos-release')
             if output.exit_code == 0:
-                match = re.search(r'CentOS Linux release ([0-9]+\.[0-9+])"', output.stdout)
-                if match:
-                    self._os_version = match.group(1)
-
-        elif self._linux_distro == "rhel":
-            output = self._client.run_command(command='cat /etc/os-release')
-            matches = re.findall(r'^VERSION_ID=(.*)', output.stdout, re.MULTILINE)
-            if matches:
-                self._os_version = matches[0].strip().rstrip('\r').strip('"')
-
-        elif self._linux_distro == "ubuntu":
-            output = self._client.run_command(command='cat /etc/os-release')
-            if output.exit_code == 0:
-                match = re.search(r'VERSION_ID=\"(.*)\"', output.stdout)
+                match = _CENTOS_VERSION_RE.search(output.stdout)
                 if match:
                     self._os_version = match.group(1)
@@ -1,6 +1,8 @@
 """Base interface for all Stackzilla supported package managers."""
+import shlex
 from abc import abstractmethod
-from typing import List, Type
+from functools import lru_cache
+from typing import List, Tuple, Type
 
 from stackzilla.logger.core import CoreLogger
 from stackzilla.utils.ssh import SSHClient
@@ -27,8 +29,14 @@ class PackageManager:
 
     @classmethod
     @abstractmethod
+    def probe_command(cls) -> str:
+        """Fetch the command which exits with a zero status if the package manager is on the host system."""
+
+    @classmethod
     def exists(cls, ssh_client: SSHClient) -> bool:
         """Called when Stackzilla wants to check if the package manager exists on the host system."""
+        output = ssh_client.run_command(command=cls.probe_command())
+        return output.exit_code == 0
 
     @abstractmethod
     def install_packages(self, packages: List[str]) -> None:
@@ -39,9 +47,48 @@ class PackageManager:
         """Invoked when it's time to delete packages."""
 
     @staticmethod
-    def suppported_managers() -> List[Type['PackageManager']]:
-        """Fetch a list of all the package manager classes."""
-        return [APK, APT, YUM, Emerge, InstallPKG]
+    def detect_command() -> str:
+        """Fetch the command which probes for every supported package manager at once.
+
+        Pass its STDOUT to parse_detect_output() to find out which package managers are present.
+        """
+        names = ' '.join(mgr.name() for mgr in PackageManager.suppported_managers())
+
+        # command -v prints the path of the binary if it's found. Some shells (ex: dash) only check the first name
+        # passed to it, so each name gets its own check.
+        return f'for mgr in {names}; do command -v $mgr; done 2>/dev/null; true'
+
+    @staticmethod
+    def parse_detect_output(stdout: str) -> List[Type['PackageManager']]:
+        """Determine the package managers found by the detect_command().
+
+        Args:
+            stdout (str): The STDOUT from the detect_command()
+
+        Returns:
+            List[Type['PackageManager']]: The package managers present on the host, in suppported_managers() order
+        """
+        found = {line.strip().rsplit('/', 1)[-1] for line in stdout.splitlines()}
+        return [mgr for mgr in PackageManager.suppported_managers() if mgr.name() in found]
+
+    @staticmethod
+    def detect(ssh_client: SSHClient) -> List[Type['PackageManager']]:
+        """Find every supported package manager on the host system, in a single round trip.
+
+        Args:
+            ssh_client (SSHClient): Client connected to the host
+
+        Returns:
+            List[Type['PackageManager']]: The package managers present on the host, in suppported_managers() order
+        """
+        output = ssh_client.run_command(command=PackageManager.detect_command())
+        return PackageManager.parse_detect_output(output.stdout)
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def suppported_managers() -> Tuple[Type['PackageManager'], ...]:
+        """Fetch all of the package manager classes. The set never changes, so it's only built once."""
+        return (APK, APT, YUM, Emerge, InstallPKG)
 
 class APK(PackageManager):
     """Apline Package Keeper. Not quite as cool as a Trapper Keeper."""
@@ -52,10 +99,9 @@ class APK(PackageManager):
         return "apk"
 
     @classmethod
-    def exists(cls, ssh_client: SSHClient) -> bool:
-        """Check if APK is present on the system."""
-        output = ssh_client.run_command(command='which apk')
-        return output.exit_code == 0
+    def probe_command(cls) -> str:
+        """Fetch the command which checks if APK is present on the system."""
+        return 'which apk'
 
     def install_packages(self, packages: List[str]) -> None:
         """Install packages using APK."""
@@ -84,10 +130,9 @@ class APT(PackageManager):
         return "apt"
 
     @classmethod
-    def exists(cls, ssh_client: SSHClient) -> bool:
-        """Check if APT is present on the system."""
-        output = ssh_client.run_command(command='which apt')
-        return output.exit_code == 0
+    def probe_command(cls) -> str:
+        """Fetch the command which checks if APT is present on the system."""
+        return 'which apt'
 
     def install_packages(self, packages: List[str]) -> None:
         """Install packages using APT."""
@@ -125,10 +170,9 @@ class YUM(PackageManager):
         return "yum"
 
     @classmethod
-    def exists(cls, ssh_client: SSHClient) -> bool:
-        """Check if YUM is present on the system."""
-        output = ssh_client.run_command(command='which yum')
-        return output.exit_code == 0
+    def probe_command(cls) -> str:
+        """Fetch the command which checks if YUM is present on the system."""
+        return 'which yum'
 
     def install_packages(self, packages: List[str]) -> None:
         """Install packages using YUM."""
@@ -160,10 +204,9 @@ class Emerge(PackageManager):
         return "emerge"
 
     @classmethod
-    def exists(cls, ssh_client: SSHClient) -> bool:
-        """Check if Emerge is present on the system."""
-        output = ssh_client.run_command(command='which emerge')
-        return output.exit_code == 0
+    def probe_command(cls) -> str:
+        """Fetch the command which checks if Emerge is present on the system."""
+        return 'which emerge'
 
     def install_packages(self, packages: List[str]) -> None:
         """Install packages using Emerge."""
@@ -194,42 +237,45 @@ class InstallPKG(PackageManager):
         return "installpkg"
 
     @classmethod
-    def exists(cls, ssh_client: SSHClient) -> bool:
-        """Check if installpkg is present on the system."""
-        output = ssh_client.run_command(command='which installpkg')
-        return output.exit_code == 0
+    def probe_command(cls) -> str:
+        """Fetch the command which checks if installpkg is present on the system."""
+        return 'which installpkg'
 
     def install_packages(self, packages: List[str]) -> None:
-        """Install packages using upgradepkg."""
-        # First, dowload all of the packages to /tmp
-        package_list = ''
-        for pkg in packages:
-            self.logger.debug(f'Downloading {pkg} to /tmp')
-            output = self.client.run_command(f'cd /tmp; wget {pkg}')
-            if output.exit_code:
-                self.logger.critical(f'Download failed with: {output.stderr}')
-                raise InstallError(output.stderr)
-
-            # Build a list of package names that we'll send to the upgradepkg command
-            package_url = pkg[1]
-            package_list += f'{package_url.split("/")[-1]} '
+        """Install packages using upgradepkg.
+
+        Args:
+            packages (List[str]): The URLs of the packages to install
+        """
+        # Download all of the packages to /tmp in one go. They're fetched in parallel on the host, so the download
+        # takes as long as the slowest package, rather than the sum of them all.
+        url_list = ' '.join(shlex.quote(url) for url in packages)
+        self.logger.debug(f'Downloading {url_list} to /tmp')
+        output = self.client.run_command(f"cd /tmp && printf '%s\\n' {url_list} | xargs -d '\\n' -n1 -P8 wget -q")
+        if output.exit_code:
+            self.logger.critical(f'Download failed with: {output.stderr}')
+            raise InstallError(output.stderr)
+
+        # Build a list of package file names that we'll send to the upgradepkg command
+        package_list = ' '.join(shlex.quote(url.split('/')[-1]) for url in packages)
 
         self.logger.debug(f'Installing {package_list}')
-        output = self.client.run_command(f'cd /tmp; upgradepkg --install-new {package_list}')
+        output = self.client.run_command(f'cd /tmp && upgradepkg --install-new {package_list}')
         if output.exit_code:
             self.logger.critical(f'Install failed with: {output.stderr}')
             raise InstallError(output.stderr)
 
     def uninstall_packages(self, packages: List[str]) -> None:
-        """Uninstall packages using removepkg."""
-        package_list = ''
-        for pkg in packages:
-            # Build a list of package names that we'll send to the upgradepkg command
-            package_url = pkg[1]
-            packages_list += f'{package_url.split("/")[-1]} '
+        """Uninstall packages using removepkg.
+
+        Args:
+            packages (List[str]): The URLs of the packages to uninstall
+        """
+        # removepkg accepts the package file names that were installed
+        package_list = ' '.join(shlex.quote(url.split('/')[-1]) for url in packages)
 
         self.logger.debug(f'Uninstalling {package_list}')
-        output = self.client.run_command(f'cd /tmp; ugpradepkg --install-new {package_list}')
+        output = self.client.run_command(f'removepkg {package_list}')
         if output.exit_code:
             self.logger.critical(f'Uninstall failed with: {output.stderr}')
             raise UninstallError(output.stderr)
@@ -0,0 +1 @@
+"""Tests for the host services module."""
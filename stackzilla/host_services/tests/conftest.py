@@ -0,0 +1,91 @@
+"""Pytest configuration file for the host services tests."""
+import subprocess
+from pathlib import Path
+from types import SimpleNamespace
+from typing import List
+
+import pytest
+
+from stackzilla.utils.ssh import SSHClient
+
+# Every system tool the host services run is replaced by this script. It logs the tool name and its arguments
+# (one "|" separated line per call), plus anything piped to it. An argument of "fail" makes it exit non-zero.
+_STUB_TOOL = """#!/bin/sh
+out=${0##*/}
+for arg in "$@"; do out="$out|$arg"; done
+if [ "${0##*/}" = chpasswd ]; then
+    while IFS= read -r line; do out="$out|$line"; done
+fi
+printf '%s\\n' "$out" >> "$STUB_LOG"
+for arg in "$@"; do
+    if [ "$arg" = fail ]; then echo "${0##*/} failed" >&2; exit 1; fi
+done
+"""
+
+# sudo is logged like the other tools, and then runs the command it was given
+_STUB_SUDO = _STUB_TOOL + """[ "$1" = -S ] && shift
+exec "$@"
+"""
+
+# su is logged like the other tools, and then runs the command passed with -c
+_STUB_SU = _STUB_TOOL + """[ "$1" = -c ] && shift
+exec /bin/sh -c "$1"
+"""
+
+_TOOLS = ['addgroup', 'adduser', 'chpasswd', 'delgroup', 'deluser', 'groupadd', 'groupdel', 'useradd', 'userdel']
+
+
+class FakeHost:
+    """Runs commands in a local shell, with only the stub tools on the PATH."""
+
+    def __init__(self, root: Path) -> None:
+        """Install the stub tools under root."""
+        self.root = root
+        self.log_file = root / 'calls.log'
+        self._bin = root / 'bin'
+        self._bin.mkdir()
+
+        for tool in _TOOLS + ['su', 'sudo']:
+            path = self._bin / tool
+            path.write_text({'su': _STUB_SU, 'sudo': _STUB_SUDO}.get(tool, _STUB_TOOL))
+            path.chmod(0o755)
+
+    @property
+    def calls(self) -> List[List[str]]:
+        """Fetch the tool calls made so far, as [tool, arg, ...] lists."""
+        if not self.log_file.exists():
+            return []
+
+        return [line.split('|') for line in self.log_file.read_text().splitlines()]
+
+    def run_command(self, command: str, sudo: bool = False, use_pty: bool = False):
+        """Run a command the way pssh would, including how it wraps sudo commands."""
+        del use_pty
+        if sudo:
+            command = f"sudo -S $SHELL -c '{command}'"
+
+        env = {'PATH': str(self._bin), 'SHELL': '/bin/sh', 'STUB_LOG': str(self.log_file)}
+        result = subprocess.run(['/bin/sh', '-c', command], env=env, capture_output=True, text=True, check=False)
+        return SimpleNamespace(stdout=result.stdout.splitlines(), stderr=result.stderr.splitlines(),
+                               exit_code=result.returncode)
+
+    def wait_finished(self, output):
+        """Commands have already finished by the time run_command() returns."""
+        del output
+
+    @property
+    def host(self) -> str:
+        """Fetch the host name."""
+        return 'fake-host'
+
+
+@pytest.fixture(name='fake_host')
+def fixture_fake_host(tmp_path) -> FakeHost:
+    """Fixture that returns a local stand-in for a remote host."""
+    return FakeHost(root=tmp_path)
+
+
+@pytest.fixture(name='ssh_client')
+def fixture_ssh_client(fake_host: FakeHost) -> SSHClient:
+    """Fixture that returns an SSH client connected to the fake host."""
+    return SSHClient(client=fake_host)
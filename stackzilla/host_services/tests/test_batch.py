@@ -0,0 +1,66 @@
+"""Tests for running batches of commands on a host."""
+import pytest
+
+from stackzilla.host_services.batch import run_batch
+from stackzilla.logger.core import CoreLogger
+from stackzilla.utils.ssh import CmdResult
+
+
+class BatchError(Exception):
+    """Raised by the batches under test."""
+
+
+class StubClient:
+    """SSH client stand-in which answers every command with the same canned output."""
+
+    def __init__(self, result: CmdResult) -> None:
+        """Save off the canned result."""
+        self.result = result
+        self.commands = []
+
+    def run_command(self, command: str, sudo: bool = False) -> CmdResult:
+        """Record the command and return the canned result."""
+        self.commands.append((command, sudo))
+        return self.result
+
+
+@pytest.fixture(name='logger')
+def fixture_logger() -> CoreLogger:
+    """Fixture that returns the logger to run the batches with."""
+    return CoreLogger(component='batch-test')
+
+def test_empty_batch(logger):
+    """An empty batch doesn't make a round trip to the host."""
+    client = StubClient(result=CmdResult(stdout='', exit_code=0))
+    run_batch(client=client, logger=logger, commands=[], error=BatchError)
+
+    assert not client.commands
+
+@pytest.mark.parametrize('sudo', [False, True])
+def test_hostile_item_name(fake_host, ssh_client, logger, sudo):
+    """Item names are printed as plain text, and never run."""
+    pwned = fake_host.root / 'pwned'
+    name = f"it's $(echo pwned > {pwned}); echo pwned > {pwned}"
+
+    with pytest.raises(BatchError, match=r'^it\'s \$\(echo pwned'):
+        run_batch(client=ssh_client, logger=logger, commands=[(name, 'useradd fail')], error=BatchError, sudo=sudo)
+
+    assert not pwned.exists()
+
+def test_failed_item(fake_host, ssh_client, logger):
+    """The failing item is named in the error, and the items after it are skipped."""
+    commands = [('a', 'groupadd a'), ('b', 'groupadd fail'), ('c', 'groupadd c')]
+
+    with pytest.raises(BatchError, match='^b: groupadd failed'):
+        run_batch(client=ssh_client, logger=logger, commands=commands, error=BatchError)
+
+    assert fake_host.calls == [['groupadd', 'a'], ['groupadd', 'fail']]
+
+def test_failure_without_marker(logger):
+    """A batch that fails before any item runs (ex: sudo is denied) raises with the raw STDERR."""
+    client = StubClient(result=CmdResult(stdout='', exit_code=1, stderr='sudo: a password is required\n'))
+
+    with pytest.raises(BatchError, match='^sudo: a password is required\n$'):
+        run_batch(client=client, logger=logger, commands=[('a', 'groupadd a')], error=BatchError, sudo=True)
+
+    assert client.commands[0][1] is True
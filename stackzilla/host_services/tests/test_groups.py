@@ -0,0 +1,73 @@
+"""Tests for the host group management."""
+import pickle
+from dataclasses import dataclass
+
+import pytest
+
+from stackzilla.host_services import groups
+from stackzilla.host_services.exceptions import UnsupportedPlatform
+from stackzilla.host_services.groups import (GroupCreateFailure,
+                                             GroupDeleteFailure,
+                                             GroupManagement, HostGroup)
+
+
+def test_create_groups(fake_host, ssh_client):
+    """Every group is created, in order, with its ID when one is given."""
+    GroupManagement(ssh_client=ssh_client, distro='ubuntu').create_groups(
+        groups=[HostGroup(name='admins', id=1001), HostGroup(name='devs')])
+
+    # The whole batch is a single sudo call
+    assert fake_host.calls[0][:2] == ['sudo', '-S']
+    assert fake_host.calls[1:] == [['addgroup', '--gid', '1001', 'admins'], ['addgroup', 'devs']]
+
+def test_hostile_group_name(fake_host, ssh_client):
+    """Quotes and command substitutions in a group name must reach the tools as plain text."""
+    pwned = fake_host.root / 'pwned'
+    name = f"it's $(echo pwned > {pwned})"
+
+    mgmt = GroupManagement(ssh_client=ssh_client, distro='rhel')
+    mgmt.create_groups(groups=[HostGroup(name=name)])
+    mgmt.delete_groups(groups=[HostGroup(name=name)])
+
+    assert not pwned.exists()
+    assert fake_host.calls[1] == ['groupadd', name]
+    assert fake_host.calls[3] == ['groupdel', name]
+
+def test_group_failure(fake_host, ssh_client):
+    """The failing group is named in the error, and the groups after it are skipped."""
+    mgmt = GroupManagement(ssh_client=ssh_client, distro='alpine')
+
+    with pytest.raises(GroupCreateFailure, match='^fail: addgroup failed'):
+        mgmt.create_groups(groups=[HostGroup(name='ok'), HostGroup(name='fail'), HostGroup(name='skipped')])
+
+    with pytest.raises(GroupDeleteFailure, match='^fail: '):
+        mgmt.delete_groups(groups=[HostGroup(name='fail')])
+
+    tools = [call[0] for call in fake_host.calls]
+    assert tools == ['sudo', 'addgroup', 'addgroup', 'sudo', 'delgroup']
+
+def test_unsupported_platform(fake_host, ssh_client):
+    """Unknown distros are rejected without running anything."""
+    with pytest.raises(UnsupportedPlatform):
+        GroupManagement(ssh_client=ssh_client, distro='beos').create_groups(groups=[HostGroup(name='devs')])
+
+    assert not fake_host.calls
+
+def test_pickle(monkeypatch):
+    """Groups survive a pickle round trip, including groups pickled before the model had slots."""
+    group = HostGroup(name='wheel', id=10)
+    assert pickle.loads(pickle.dumps(group)) == group
+
+    # Pickle a group using the model as it was before slots were added
+    @dataclass
+    class OldHostGroup:
+        name: str
+        id: int = None # pylint: disable=invalid-name
+
+    OldHostGroup.__qualname__ = 'HostGroup'
+    OldHostGroup.__module__ = groups.__name__
+    with monkeypatch.context() as patch:
+        patch.setattr(groups, 'HostGroup', OldHostGroup)
+        data = pickle.dumps(OldHostGroup(name='wheel', id=10))
+
+    assert pickle.loads(data) == group
@@ -0,0 +1,64 @@
+"""Tests for the host services fact checks."""
+from stackzilla.host_services.host_services import HostServices
+from stackzilla.utils.ssh import CmdResult
+
+
+class StubClient:
+    """SSH client stand-in which answers every command with the same canned output."""
+
+    def __init__(self, stdout: str, exit_code: int = 0) -> None:
+        """Save off the canned output."""
+        self.stdout = stdout
+        self.exit_code = exit_code
+        self.commands = []
+
+    def run_command(self, command: str, sudo: bool = False, use_pty: bool = False) -> CmdResult:
+        """Record the command and return the canned output."""
+        del sudo, use_pty
+        self.commands.append(command)
+        return CmdResult(stdout=self.stdout, exit_code=self.exit_code)
+
+    @property
+    def host(self) -> str:
+        """Fetch the host name."""
+        return 'stub-host'
+
+
+def run_facts(stdout: str, commands):
+    """Run the fact commands against a stub client, skipping the fact check done in the constructor."""
+    host_services = HostServices.__new__(HostServices)
+    host_services._client = StubClient(stdout=stdout) # pylint: disable=protected-access
+    return host_services._run_fact_commands(commands) # pylint: disable=protected-access
+
+def test_fact_output():
+    """Each command gets its own output and exit code."""
+    results = run_facts('##FACT:a\nline 1\nline 2\n##FACT:a:0\n##FACT:b\n##FACT:b:2\n', {'a': 'x', 'b': 'y'})
+
+    assert results['a'] == CmdResult(stdout='line 1\nline 2\n', exit_code=0)
+    assert results['b'] == CmdResult(stdout='', exit_code=2)
+
+def test_missing_closing_marker():
+    """A command that never reports its exit code is a failure, but doesn't affect the commands after it."""
+    results = run_facts('##FACT:a\npartial\n##FACT:b\nok\n##FACT:b:0\n', {'a': 'x', 'b': 'y'})
+
+    assert results['a'] == CmdResult(stdout='', exit_code=1)
+    assert results['b'] == CmdResult(stdout='ok\n', exit_code=0)
+
+def test_no_trailing_newline():
+    """Output without a trailing newline leaves the closing marker mid-line, where it's still found."""
+    results = run_facts('##FACT:a\nLinux##FACT:a:0\n##FACT:b\nlast##FACT:b:0', {'a': 'x', 'b': 'y'})
+
+    assert results['a'] == CmdResult(stdout='Linux\n', exit_code=0)
+    assert results['b'] == CmdResult(stdout='last\n', exit_code=0)
+
+def test_non_posix_host():
+    """A shell that can't run the fact script reports no markers, so every fact check fails."""
+    client = StubClient(stdout="'echo' is not recognized as an internal or external command\n", exit_code=1)
+    host_services = HostServices(ssh_client=client)
+
+    # Every fact check went out in a single round trip
+    assert len(client.commands) == 1
+    assert host_services.is_posix is False
+    assert host_services.linux_distro == '<unknown>'
+    assert host_services.os_version == ''
+    assert not host_services.package_managers
@@ -0,0 +1,115 @@
+"""Tests for the host user management."""
+import pickle
+from dataclasses import dataclass
+
+import pytest
+
+from stackzilla.host_services import users
+from stackzilla.host_services.exceptions import UnsupportedPlatform
+from stackzilla.host_services.users import (HostUser, UserCreateError,
+                                            UserDeleteError, UserManagement)
+
+
+def test_create_users(fake_host, ssh_client):
+    """Every user is created with sudo useradd, and given their password through chpasswd."""
+    UserManagement(ssh_client=ssh_client, distro='ubuntu').create_users(
+        users=[HostUser(name='bob', shell='/bin/bash', id=1001, password='secret'), HostUser(name='amy')])
+
+    calls = fake_host.calls
+    assert calls[0] == ['sudo', 'useradd', '-s', '/bin/bash', '-u', '1001', 'bob']
+    assert calls[1] == ['useradd', '-s', '/bin/bash', '-u', '1001', 'bob']
+    assert calls[2][:4] == ['sudo', '-S', '/bin/sh', '-c']
+    assert calls[3] == ['chpasswd', 'bob:secret']
+    assert calls[4:] == [['sudo', 'useradd', 'amy'], ['useradd', 'amy']]
+
+def test_create_alpine_users(fake_host, ssh_client):
+    """Alpine users are created with adduser, which isn't run with sudo."""
+    UserManagement(ssh_client=ssh_client, distro='alpine').create_users(
+        users=[HostUser(name='bob', home_dir='/home/bob', password='secret')])
+
+    calls = fake_host.calls
+    assert calls[0] == ['adduser', '-D', '-h', '/home/bob', 'bob']
+    assert calls[1][:4] == ['sudo', '-S', '/bin/sh', '-c']
+    assert calls[2] == ['chpasswd', 'bob:secret']
+
+def test_create_amzn_users(fake_host, ssh_client):
+    """Amazon Linux passwords are set through su."""
+    UserManagement(ssh_client=ssh_client, distro='amzn').create_users(users=[HostUser(name='bob', password='secret')])
+
+    calls = fake_host.calls
+    assert calls[0] == ['sudo', 'useradd', 'bob']
+    assert calls[2][:3] == ['sudo', 'su', '-c']
+    assert calls[4] == ['chpasswd', 'bob:secret']
+
+@pytest.mark.parametrize('distro, tool', [('alpine', 'deluser'), ('ubuntu', 'deluser'), ('rhel', 'userdel')])
+def test_delete_users(fake_host, ssh_client, distro, tool):
+    """The whole batch of deletions is run as a single sudo call."""
+    UserManagement(ssh_client=ssh_client, distro=distro).delete_users(users=[HostUser(name='bob'), HostUser(name='amy')])
+
+    calls = fake_host.calls
+    assert calls[0][:2] == ['sudo', '-S']
+    assert calls[1:] == [[tool, 'bob'], [tool, 'amy']]
+
+@pytest.mark.parametrize('distro', ['amzn', 'rhel'])
+def test_hostile_user(fake_host, ssh_client, distro):
+    """Quotes and command substitutions in a user name or password must reach the tools as plain text."""
+    pwned = fake_host.root / 'pwned'
+    name = f"it's $(echo pwned > {pwned})"
+    password = f"p'w\"d $(echo pwned > {pwned})"
+
+    mgmt = UserManagement(ssh_client=ssh_client, distro=distro)
+    mgmt.create_users(users=[HostUser(name=name, password=password)])
+    mgmt.delete_users(users=[HostUser(name=name)])
+
+    assert not pwned.exists()
+    assert ['useradd', name] in fake_host.calls
+    assert ['chpasswd', f'{name}:{password}'] in fake_host.calls
+    assert ['userdel', name] in fake_host.calls
+
+def test_user_failure(fake_host, ssh_client):
+    """The failing user is named in the error, and the users after it are skipped."""
+    with pytest.raises(UserCreateError, match='^fail: adduser failed'):
+        UserManagement(ssh_client=ssh_client, distro='alpine').create_users(
+            users=[HostUser(name='ok'), HostUser(name='fail'), HostUser(name='skipped')])
+
+    with pytest.raises(UserDeleteError, match='^fail: deluser failed'):
+        UserManagement(ssh_client=ssh_client, distro='ubuntu').delete_users(users=[HostUser(name='fail')])
+
+    tools = [call[0] for call in fake_host.calls]
+    assert tools == ['adduser', 'adduser', 'sudo', 'deluser']
+
+def test_unsupported_platform(fake_host, ssh_client):
+    """Unknown distros are rejected without running anything."""
+    mgmt = UserManagement(ssh_client=ssh_client, distro='beos')
+
+    with pytest.raises(UnsupportedPlatform):
+        mgmt.create_users(users=[HostUser(name='bob')])
+
+    with pytest.raises(UnsupportedPlatform):
+        mgmt.delete_users(users=[HostUser(name='bob')])
+
+    assert not fake_host.calls
+
+def test_pickle(monkeypatch):
+    """Users survive a pickle round trip, including users pickled before the model had slots."""
+    user = HostUser(name='bob', group='devs', id=1001, shell='/bin/sh')
+    assert pickle.loads(pickle.dumps(user)) == user
+
+    # Pickle a user using the model as it was before slots were added
+    @dataclass
+    class OldHostUser: # pylint: disable=too-many-instance-attributes
+        name: str
+        extra_groups: str = None
+        group: str = None
+        home_dir: str = None
+        id: int = None # pylint: disable=invalid-name
+        password: str = None
+        shell: str = None
+
+    OldHostUser.__qualname__ = 'HostUser'
+    OldHostUser.__module__ = users.__name__
+    with monkeypatch.context() as patch:
+        patch.setattr(users, 'HostUser', OldHostUser)
+        data = pickle.dumps(OldHostUser(name='bob', group='devs', id=1001, shell='/bin/sh'))
+
+    assert pickle.loads(data) == user
@@ -1,24 +1,63 @@
 """Module for managing host system users."""
+import shlex
 from dataclasses import dataclass
-from typing import List
+from typing import List, Tuple
 
+from stackzilla.host_services.batch import run_batch
+from stackzilla.host_services.distros import KNOWN_DISTROS
 from stackzilla.host_services.exceptions import UnsupportedPlatform
 from stackzilla.logger.core import CoreLogger
 from stackzilla.utils.ssh import SSHClient
 
 
-@dataclass
+@dataclass(init=False)
 class HostUser:
     """Model for a system user."""
 
+    __slots__ = ('name', 'extra_groups', 'group', 'home_dir', 'id', 'password', 'shell')
+
     name: str
     # Optional attributes
-    extra_groups: str = None
-    group: str = None
-    home_dir: str = None
-    id: int = None          # pylint: disable=invalid-name
-    password: str = None
-    shell: str = None
+    extra_groups: str
+    group: str
+    home_dir: str
+    id: int                 # pylint: disable=invalid-name
+    password: str
+    shell: str
+
+    # pylint: disable=too-many-arguments,too-many-positional-arguments,invalid-name,redefined-builtin
+    def __init__(self, name: str, extra_groups: str = None, group: str = None, home_dir: str = None, id: int = None,
+                 password: str = None, shell: str = None) -> None:
+        """Default constructor."""
+        self.name = name
+        self.extra_groups = extra_groups
+        self.group = group
+        self.home_dir = home_dir
+        self.id = id
+        self.password = password
+        self.shell = shell
+
+    def __setstate__(self, state) -> None:
+        """Restore a pickled user, including users pickled before the model had slots."""
+        # Slotted objects pickle as (None, slot values), older pickles are just the instance dict
+        for name, value in (state[1] if isinstance(state, tuple) else state).items():
+            setattr(self, name, value)
+
+# Alpine creates users with an unprivileged 'adduser', every other supported distro uses 'sudo useradd'.
+# (command, ((HostUser field, option flag), ...))
+_ADDUSER = ('adduser -D', (('home_dir', '-h'), ('shell', '-s'), ('id', '-u'), ('group', '-g'),
+                           ('extra_groups', '-G')))
+_USERADD = ('sudo useradd', (('home_dir', '-d'), ('shell', '-s'), ('id', '-u'), ('group', '-g'),
+                             ('extra_groups', '-G')))
+_ADDUSER_DISTROS = frozenset({'alpine'})
+
+# Runs the (quoted) chpasswd command as root. Amazon Linux goes through su, every other distro uses the same wrapper
+# as SSHClient.run_command(sudo=True).
+_CHPASSWD_AMZN = 'sudo su -c {command}'
+_CHPASSWD = 'sudo -S $SHELL -c {command}'
+
+# Distros which delete users with 'deluser'. Every other supported distro uses 'userdel'.
+_DELUSER_DISTROS = frozenset({'alpine', 'ubuntu'})
 
 class UserCreateError(Exception):
     """Raised when the user creation fails."""
@@ -35,138 +74,60 @@ class UserManagement:
         self._distro: str = distro
         self._logger: CoreLogger = CoreLogger(component='user-mgmt')
 
+        if distro not in KNOWN_DISTROS:
+            self._logger.debug('Unsupported platform, user operations will fail', extra={'distro': distro})
+
     def create_users(self, users: List[HostUser]):
-        """Create the users on the host system."""
-        if self._distro == 'amzn':
-            self._create_amzn_users(users=users)
-        elif self._distro == 'alpine':
-            self._create_alpine_users(users=users)
-        elif self._distro in ['centos', 'debian', 'fedora', 'gentoo', 'opensuse-leap', 'rhel', 'slackware', 'ubuntu']:
-            self._create_standard_users(users=users)
-        else:
+        """Create the users on the host system, in a single round trip.
+
+        Args:
+            users (List[HostUser]): The users to create
+
+        Raises:
+            UserCreateError: Raised if creating any of the users (or setting their password) fails
+            UnsupportedPlatform: Raised if the distro is not supported
+        """
+        if self._distro not in KNOWN_DISTROS:
             self._logger.critical('Unsupported platform detected in create_users', extra={'distro': self._distro})
             raise UnsupportedPlatform(self._distro)
 
-    def delete_users(self, users: List[HostUser]):
-        """Delete users from the remote host."""
-        if self._distro == 'amzn':
-            self._delete_amazon_users(users=users)
-        elif self._distro in ['alpline', 'ubuntu']:
-            self._delete_alpine_ubuntu_users(users=users)
-        elif self._distro in ['centos', 'debian', 'fedora', 'gentoo', 'rhel', 'slackware', 'opensuse-leap']:
-            self._delete_users(users=users)
-        else:
-            self._logger.critical('Unsupported platform detected in delete_users', extra={'distro': self._distro})
-            raise UnsupportedPlatform(self._distro)
+        cmd, options = _ADDUSER if self._distro in _ADDUSER_DISTROS else _USERADD
+        chpasswd_wrapper = _CHPASSWD_AMZN if self._distro == 'amzn' else _CHPASSWD
 
-    def _create_amzn_users(self, users: List[HostUser]):
-        """Build up and execute the CLI command to create the list of users."""
+        user_commands: List[Tuple[str, str]] = []
         for user in users:
-            cmd = 'sudo useradd '
-
-            if user.home_dir:
-                cmd += f' -d {user.home_dir}'
-
-            if user.shell:
-                cmd += f' -s {user.shell}'
-
-            if user.id:
-                cmd += f' -u {user.id}'
-
-            if user.group:
-                cmd += f' -g {user.group}'
-
-            if user.extra_groups:
-                cmd += f' -G {user.extra_groups}'
-
-            cmd += f' {user.name}'
-
-            self._logger.debug(f'Creating user {user.name} on an Amazon Linux host')
-            output = self._client.run_command(command=cmd)
-
-            if output.exit_code:
-                raise UserCreateError(output.stderr)
+            user_cmd = cmd
+            for field, flag in options:
+                value = getattr(user, field)
+                if value:
+                    user_cmd += f' {flag} {shlex.quote(str(value))}'
+            user_cmd += f' {shlex.quote(user.name)}'
 
             if user.password:
-                output = self._client.run_command(command=f'sudo su -c "echo {user.name}:{user.password} | chpasswd"')
-                if output.exit_code:
-                    self._logger.critical(f'User creation failed: {output.stderr}')
-                    raise UserCreateError(output.stderr)
-
-    def _create_alpine_users(self, users: List[HostUser]):
-        """Create a list of users on an Alpine-based host."""
-        for user in users:
-            cmd = 'adduser -D'
-
-            if user.home_dir:
-                cmd += f' -h {user.home_dir}'
+                chpasswd = f"printf '%s\\n' {shlex.quote(f'{user.name}:{user.password}')} | chpasswd"
+                user_cmd += f' && {chpasswd_wrapper.format(command=shlex.quote(chpasswd))}'
 
-            if user.shell:
-                cmd += f' -s {user.shell}'
+            self._logger.debug(f'Creating user {user.name}', extra={'distro': self._distro})
+            user_commands.append((user.name, user_cmd))
 
-            if user.id:
-                cmd += f' -u {user.id}'
+        # The batch isn't run with sudo=True, since adduser is run unprivileged on Alpine. The privileged commands
+        # carry their own sudo instead.
+        run_batch(client=self._client, logger=self._logger, commands=user_commands, error=UserCreateError)
 
-            if user.group:
-                cmd += f' -g {user.group}'
-
-            if user.extra_groups:
-                cmd += f' -G {user.extra_groups}'
-            cmd += f' {user.name}'
-
-            output = self._client.run_command(command=cmd)
-            if output.exit_code:
-                raise UserCreateError(output.stderr)
-
-            if user.password:
-                output = self._client.run_command(command=f'echo "{user.name}:{user.password}" | chpasswd', sudo=True)
-                if output.exit_code:
-                    raise UserCreateError(output.stderr)
-
-    def _create_standard_users(self, users: List[HostUser]):
-        """Creates users via the 'useradd' CLI tool. Works on most Linux distros."""
-        for user in users:
-            cmd = 'sudo useradd '
-
-            if user.home_dir:
-                cmd += f' -d {user.home_dir}'
-            if user.shell:
-                cmd += f' -s {user.shell}'
-            if user.id:
-                cmd += f' -u {user.id}'
-            if user.group:
-                cmd += f' -g {user.group}'
-            if user.extra_groups:
-                cmd += f' -G {user.extra_groups}'
-
-            cmd += f' {user.name}'
-
-            output = self._client.run_command(command=cmd)
-            if output.exit_code:
-                raise UserCreateError(output.stderr)
-
-            if user.password:
-                output = self._client.run_command(command=f'echo "{user.name}:{user.password}" | chpasswd', sudo=True)
-                if output.exit_code:
-                    raise UserCreateError(output.stderr)
+    def delete_users(self, users: List[HostUser]):
+        """Delete users from the remote host, in a single round trip.
 
-    def _delete_amazon_users(self, users: List[HostUser]):
-        """Delete users from an Amazon Linux host."""
-        for user in users:
-            output = self._client.run_command(command=f'userdel {user.name}', sudo=True)
-            if output.exit_code:
-                raise UserDeleteError(output.stderr)
+        Args:
+            users (List[HostUser]): The users to delete
 
-    def _delete_alpine_ubuntu_users(self, users: List[HostUser]):
-        """Delete users from an Alpline host."""
-        for user in users:
-            output = self._client.run_command(command=f'deluser {user.name}', sudo=True)
-            if output.exit_code:
-                raise UserDeleteError(output.stderr)
+        Raises:
+            UserDeleteError: Raised if deleting any of the users fails
+            UnsupportedPlatform: Raised if the distro is not supported
+        """
+        if self._distro not in KNOWN_DISTROS:
+            self._logger.critical('Unsupported platform detected in delete_users', extra={'distro': self._distro})
+            raise UnsupportedPlatform(self._distro)
 
-    def _delete_users(self, users: List[HostUser]):
-        """Delete users from a Linux distro using the 'userdel' CLI command."""
-        for user in users:
-            output = self._client.run_command(command=f'userdel {user.name}', sudo=True)
-            if output.exit_code:
-                raise UserDeleteError(output.stderr)
+        cmd = 'deluser' if self._distro in _DELUSER_DISTROS else 'userdel'
+        user_commands = [(user.name, f'{cmd} {shlex.quote(user.name)}') for user in users]
+        run_batch(client=self._client, logger=self._logger, commands=user_commands, error=UserDeleteError, sudo=True)
@@ -9,4 +9,7 @@ def database():
     """Fixture that returns an in-memory database."""
     memory_db = StackzillaSQLiteDB(name='test')
     memory_db.create(in_memory=True)
-    return memory_db
+    yield memory_db
+
+    # Release the shared in-memory database so the next test starts with a clean schema
+    memory_db.close()
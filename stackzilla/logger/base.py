@@ -50,6 +50,19 @@ class BaseLogger:
         """
         self._log(message=message, extra=extra, level=CRITICAL)
 
+    def is_enabled_for(self, level: int) -> bool:
+        """Check if messages at a level will be logged.
+
+        Useful for skipping the construction of expensive messages that would be thrown away.
+
+        Args:
+            level (int): The Python logging level (ex: logging.DEBUG)
+
+        Returns:
+            bool: True if messages at the level are handled
+        """
+        return self._logger.isEnabledFor(level)
+
     def _log(self, message: str, level: int, extra: Optional[dict] = None) -> None:
         """Private method which will add the component to the extra data and invoke the Python logger.
 
@@ -2,7 +2,8 @@
 import inspect
 from abc import abstractmethod
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
 
 from stackzilla.attribute import StackzillaAttribute
 from stackzilla.database.base import StackzillaDB
@@ -82,9 +83,31 @@ class StackzillaResource(metaclass=SZMeta):
         self.attribute_modified_event = StackzillaEvent()
         self.attributes_modified_event = StackzillaEvent()
 
+    def __init_subclass__(cls, **kwargs) -> None:
+        """Work out the path and attribute names for each resource class once, when the class is defined.
+
+        The path only depends on the module and class names, yet it's used for every database call and every
+        comparison between resource classes. Likewise, the attribute names are fixed by the class definition.
+        """
+        super().__init_subclass__(**kwargs)
+        cls._sz_path = cls._build_path(remove_prefix=False)
+        cls._sz_short_path = cls._build_path(remove_prefix=True)
+        cls._sz_attributes = cls._find_attributes()
+        cls._sz_attribute_names = tuple(cls._sz_attributes)
+
     @classmethod
     def path(cls, remove_prefix: bool=False) -> str:
         """A unique name (within the blueprint) for this resource."""
+        # Only use the paths cached for this exact class, never ones inherited from a parent class
+        cached = cls.__dict__.get('_sz_short_path' if remove_prefix else '_sz_path')
+        if cached is not None:
+            return cached
+
+        return cls._build_path(remove_prefix=remove_prefix)
+
+    @classmethod
+    def _build_path(cls, remove_prefix: bool) -> str:
+        """Build the path for this resource from its module and class names."""
         path = f'{cls.__module__}.{cls.__name__}'
 
         # Always replace the DB prevfix
@@ -106,11 +129,12 @@ class StackzillaResource(metaclass=SZMeta):
 
     def update(self) -> None:
         """Apply the changes to this resource."""
-        # Update any resource details
-        StackzillaDB.db.update_resource(resource=self)
+        # Update the resource details and all of its attributes with a single commit
+        with StackzillaDB.db.transaction():
+            StackzillaDB.db.update_resource(resource=self)
 
-        for name in self.attributes:
-            StackzillaDB.db.update_attribute(resource=self, name=name, value=getattr(self, name))
+            for name in self.attribute_names():
+                StackzillaDB.db.update_attribute(resource=self, name=name, value=getattr(self, name))
 
     def delete(self) -> None:
         """Delete a previously created resource."""
@@ -135,7 +159,7 @@ class StackzillaResource(metaclass=SZMeta):
         # The exception that will be raised, if any issues are found
         verify_error_info = ResourceVerifyError(resource_name=self.path(True))
 
-        for attr_name, attribute in self.attributes.items():
+        for attr_name, attribute in self.class_attributes().items():
 
             # Get the attribute value from the resource
             attr_value = self.get_attribute_value(name=attr_name)
@@ -225,6 +249,41 @@ class StackzillaResource(metaclass=SZMeta):
         """
         return getattr(self, name)
 
+    @classmethod
+    def attribute_names(cls) -> Tuple[str, ...]:
+        """Fetch the names of all the StackzillaAttribute objects defined for the class.
+
+        Returns:
+            Tuple[str, ...]: The attribute names, sorted.
+        """
+        # Only use the names cached for this exact class, never ones inherited from a parent class
+        cached = cls.__dict__.get('_sz_attribute_names')
+        if cached is not None:
+            return cached
+
+        return tuple(cls._find_attributes())
+
+    @classmethod
+    def class_attributes(cls) -> Mapping[str, StackzillaAttribute]:
+        """Fetch the StackzillaAttribute objects defined for the class, without touching any instance values.
+
+        Unlike the attributes property, this is a read-only view of the per-class cache. Nothing is copied and the
+        shared StackzillaAttribute objects aren't modified, which makes it safe to use from multiple threads.
+
+        Returns:
+            Mapping[str, StackzillaAttribute]: The StackzillaAttribute objects, keyed by name.
+        """
+        cached = cls.__dict__.get('_sz_attributes')
+        if cached is None:
+            cached = cls._find_attributes()
+
+        return MappingProxyType(cached)
+
+    @classmethod
+    def _find_attributes(cls) -> Dict[str, StackzillaAttribute]:
+        """Find all of the class variables (NOT instance vars) that derive from the StackzillaAttribute class."""
+        return {name: obj for name, obj in inspect.getmembers(cls) if isinstance(obj, StackzillaAttribute)}
+
     @property
     def attributes(self) -> Dict[str, StackzillaAttribute]:
         """Fetch all of the StackzillaAttribute objects defined for the class.
@@ -234,14 +293,13 @@ class StackzillaResource(metaclass=SZMeta):
         """
         results = {}
 
-        # Find all of the class variables (NOT instance vars) that derive from the StackzillaAttribute class
-        for name, obj in inspect.getmembers(self.__class__):
-            if isinstance(obj, StackzillaAttribute):
-                # Save off the StackzillaAttribute in the results
-                results[name] = obj
+        # The descriptors (and their defaults) were collected when the class was defined
+        for name, obj in self.class_attributes().items():
+            # Save off the StackzillaAttribute in the results
+            results[name] = obj
 
-                # Grab the value of the attribute from our own dictionary, storing it into the StackzillaAttribute instance itself
-                results[name].value = self.__dict__.get(name, obj.default)
+            # Grab the value of the attribute from our own dictionary, storing it into the StackzillaAttribute instance itself
+            results[name].value = self.__dict__.get(name, obj.default)
 
         return results
 
@@ -295,7 +353,7 @@ class StackzillaResource(metaclass=SZMeta):
 
         # Load all of the attributes from the database
         try:
-            for attribute_name in obj.attributes:
+            for attribute_name in obj.attribute_names():
                 value = StackzillaDB.db.get_attribute(resource=obj, name=attribute_name)
                 setattr(obj, attribute_name, value)
         except ResourceNotFound as err:
@@ -315,14 +373,7 @@ class StackzillaResource(metaclass=SZMeta):
 
     def delete_from_db(self):
         """Delete the resource, and all its attributes, from the database."""
-        for name in self.attributes:
-            try:
-                StackzillaDB.db.delete_attribute(resource=self, name=name)
-            except ResourceNotFound:
-                self._core_logger.debug(message='Resource not found during attribute deletion',
-                                        extra={'resource_name': self.path()})
-
-        # If the path for the resource is rooted with the database prefix, replace it with '.'
+        # Deleting the resource row cascades to all of its attributes, so they're removed by the same statement
         try:
             StackzillaDB.db.delete_resource(path=self.path())
         except ResourceNotFound:
@@ -2,7 +2,7 @@
 import time
 from abc import abstractmethod
 from dataclasses import dataclass
-from typing import List
+from typing import Any, List, Optional, Tuple
 
 from pssh.clients.ssh import SSHClient as PSSHClient
 from pssh.exceptions import AuthenticationError
@@ -14,6 +14,7 @@ from stackzilla.host_services.users import HostUser
 from stackzilla.resource.base import StackzillaResource
 from stackzilla.resource.compute.exceptions import (NoPackageManagers,
                                                     SSHConnectError)
+from stackzilla.resource.exceptions import AttributeModifyFailure
 from stackzilla.utils.ssh import SSHClient
 
 
@@ -45,9 +46,18 @@ class StackzillaCompute(StackzillaResource):
         """Constructor for the compute class."""
         super().__init__()
 
+        # Host services (and the SSH connection behind them) are shared by the host operations of a single create or
+        # update, so the connection and fact gathering only happen once. See _host_services().
+        self._host_services_cache: Optional[HostServices] = None
+        self._host_services_client: Optional[SSHClient] = None
+        self._host_services_target: Optional[Tuple[SSHAddress, SSHCredentials]] = None
+
         # Attach a handler for when the instance is done being created
         self.create_done_event.attach(handler=self._on_create_done)
 
+        # The *_modified() handlers are done with the host once all of the modifications have been applied
+        self.attributes_modified_event.attach(handler=self._on_attributes_modified_done)
+
     def _on_create_done(self, sender: StackzillaResource): # pylint: disable=unused-argument
         """Event handler for when the compute creation is complete.
 
@@ -55,21 +65,54 @@ class StackzillaCompute(StackzillaResource):
             sender (StackzillaResource): Sender of the event
         """
         if self.users or self.groups or self.packages:
-            ssh_client = self.ssh_connect()
-            host_service = HostServices(ssh_client=ssh_client)
+            try:
+                host_service = self._host_services()
+
+                if self.groups:
+                    host_service.create_groups(groups=self.groups)
+
+                if self.users:
+                    host_service.create_users(users=self.users)
+
+                if self.packages:
+                    if len(host_service.package_managers) == 0:
+                        raise NoPackageManagers('No package managers available')
+
+                    pkg_mgr = host_service.package_managers[0]
+                    pkg_mgr.install_packages(packages=self.packages)
+            finally:
+                self._release_host_services()
 
-            if self.groups:
-                host_service.create_groups(groups=self.groups)
+    def _on_attributes_modified_done(self, sender: StackzillaResource, **kwargs): # pylint: disable=unused-argument
+        """Event handler for when all of the attribute modifications have been applied.
 
-            if self.users:
-                host_service.create_users(users=self.users)
+        Args:
+            sender (StackzillaResource): Sender of the event
+        """
+        self._release_host_services()
+
+    def _on_attribute_modified(self, attribute_name: str, previous_value: Any, new_value: Any) -> bool:
+        """Invokes the modify method for an attribute, releasing the host services connection if it fails.
 
-            if self.packages:
-                if len(host_service.package_managers) == 0:
-                    raise NoPackageManagers('No package managers available')
+        Only an AttributeModifyFailure lets the update carry on to attributes_modified_event, which normally releases
+        the connection. Anything else aborts the update, so the connection has to be released here.
 
-                pkg_mgr = host_service.package_managers[0]
-                pkg_mgr.install_packages(packages=self.packages)
+        Args:
+            attribute_name (str): The name of the attribute
+            previous_value (Any): The value of the attribute before modification
+            new_value (Any): The value of the attribute after modification
+
+        Returns:
+            bool: True if the modified handler is present, and was called
+        """
+        try:
+            return super()._on_attribute_modified(attribute_name=attribute_name, previous_value=previous_value,
+                                                  new_value=new_value)
+        except AttributeModifyFailure:
+            raise
+        except Exception:
+            self._release_host_services()
+            raise
 
     @abstractmethod
     def ssh_credentials(self) -> SSHCredentials:
@@ -108,9 +151,47 @@ class StackzillaCompute(StackzillaResource):
         Args:
             service (str): Name of the service to restart.
         """
-        client = self.ssh_connect()
-        host_services = HostServices(ssh_client=client)
-        host_services.restart_service(service=service)
+        # Reuse the connection if this is called from a create or modify handler, otherwise it's a one-off
+        one_off = self._host_services_cache is None
+        try:
+            self._host_services().restart_service(service=service)
+        finally:
+            if one_off:
+                self._release_host_services()
+
+    def _host_services(self) -> HostServices:
+        """Fetch the host services for this compute, connecting to it on first use.
+
+        Returns:
+            HostServices: Host services bound to this instance's SSH connection
+        """
+        # A modify handler may have changed the address or credentials, in which case the old connection is stale
+        target = (self.ssh_address(), self.ssh_credentials())
+        if self._host_services_cache is not None and target != self._host_services_target:
+            self._release_host_services()
+
+        if self._host_services_cache is None:
+            client = self.ssh_connect()
+            try:
+                self._host_services_cache = HostServices(ssh_client=client)
+            except Exception:
+                client.disconnect()
+                raise
+
+            self._host_services_client = client
+            self._host_services_target = target
+
+        return self._host_services_cache
+
+    def _release_host_services(self) -> None:
+        """Disconnect the cached host services connection, if there is one."""
+        client = self._host_services_client
+        self._host_services_cache = None
+        self._host_services_client = None
+        self._host_services_target = None
+
+        if client is not None:
+            client.disconnect()
 
     def ssh_connect(self, retry_count: int=3, retry_delay: int=5) -> SSHClient:
         """Connect to the server via SSH.
@@ -169,8 +250,7 @@ class StackzillaCompute(StackzillaResource):
 
     def users_modified(self, previous_value: List[HostUser], new_value: List[HostUser]):
         """Handle the modification of the users parameter."""
-        client = self.ssh_connect()
-        host_services = HostServices(ssh_client=client)
+        host_services = self._host_services()
 
         # Delete any users
         users_to_delete = []
@@ -196,8 +276,7 @@ class StackzillaCompute(StackzillaResource):
 
     def groups_modified(self, previous_value: List[HostGroup], new_value: List[HostGroup]):
         """Handle the modification of the groups parameter."""
-        client = self.ssh_connect()
-        host_services = HostServices(ssh_client=client)
+        host_services = self._host_services()
 
         # Delete any groups
         groups_to_delete = []
@@ -221,8 +300,7 @@ class StackzillaCompute(StackzillaResource):
 
     def packages_modified(self, previous_value: List[str], new_value: List[str]):
         """Handle when the list of packages is updated."""
-        client = self.ssh_connect()
-        host_services = HostServices(ssh_client=client)
+        host_services = self._host_services()
         pkg_mgr = host_services.package_managers[0]
 
         # First pass will delete any packages that were removed from the host
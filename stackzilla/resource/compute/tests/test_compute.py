@@ -0,0 +1,83 @@
+"""Tests for the host services connection shared by the compute handlers."""
+import pytest
+
+from stackzilla.host_services.users import HostUser, UserCreateError
+from stackzilla.resource.compute import compute as compute_module
+from stackzilla.resource.compute.compute import (SSHAddress, SSHCredentials,
+                                                 StackzillaCompute)
+
+
+class FakeClient:
+    """SSH client stand-in which counts how many times it was disconnected."""
+
+    def __init__(self) -> None:
+        """Start off connected."""
+        self.disconnects = 0
+
+    def disconnect(self) -> None:
+        """Record the disconnect."""
+        self.disconnects += 1
+
+
+class FakeHostServices:
+    """Host services stand-in without any package managers, which fails to create users."""
+
+    package_managers = []
+
+    def __init__(self, ssh_client: FakeClient) -> None:
+        """Skip the fact check."""
+        del ssh_client
+
+    def create_users(self, users) -> None:
+        """Fail, as if the remote useradd did."""
+        raise UserCreateError(f'{users[0].name}: useradd failed')
+
+
+class Compute(StackzillaCompute):
+    """Compute resource which connects to the fake client."""
+
+    def ssh_credentials(self) -> SSHCredentials:
+        """Provide the credentials needed to SSH into a host."""
+        return SSHCredentials(username='root', password=None, key=None)
+
+    def ssh_address(self) -> SSHAddress:
+        """Provide the hostname/ip and port number for connecting to a host."""
+        return SSHAddress(host='compute', port=22)
+
+    def start(self, wait_for_online: True) -> None:
+        """Nothing to start."""
+
+    def stop(self, wait_for_offline: True) -> None:
+        """Nothing to stop."""
+
+
+@pytest.fixture(name='client')
+def fixture_client(monkeypatch) -> FakeClient:
+    """Fixture that returns the client every Compute connects to."""
+    client = FakeClient()
+    monkeypatch.setattr(Compute, 'ssh_connect', lambda self: client)
+    monkeypatch.setattr(compute_module, 'HostServices', FakeHostServices)
+    return client
+
+def test_release_after_modifications(client):
+    """The connection is kept across the modify handlers, and released once they're all done."""
+    compute = Compute()
+    compute.groups_modified(previous_value=None, new_value=None)
+    compute.users_modified(previous_value=None, new_value=None)
+    assert client.disconnects == 0
+
+    compute.attributes_modified_event.invoke(sender=compute, attributes={})
+    assert client.disconnects == 1
+
+@pytest.mark.parametrize('attribute_name, new_value, error', [('users', [HostUser(name='bob')], UserCreateError),
+                                                              ('packages', ['nginx'], IndexError)])
+def test_release_on_failure(client, attribute_name, new_value, error):
+    """A failing modify handler aborts the update, and still releases the connection."""
+    compute = Compute()
+
+    # pylint: disable=protected-access
+    with pytest.raises(error):
+        compute._on_attribute_modified(attribute_name=attribute_name, previous_value=None, new_value=new_value)
+
+    assert client.disconnects == 1
+    assert compute._host_services_cache is None
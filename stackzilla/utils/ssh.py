@@ -32,6 +32,11 @@ class SSHClient:
         Returns:
             Tuple[str, int]: The STDOUT for the command and the exit code
         """
+        if sudo:
+            # Parallel SSH wraps sudo commands in single quotes (sudo -S $SHELL -c '<command>') without escaping them.
+            # Close the quote, add an escaped quote, and reopen it, so quotes within the command are passed through.
+            command = command.replace("'", "'\\''")
+
         output: HostOutput = self._client.run_command(command=command, sudo=sudo, use_pty=use_pty)
         self._client.wait_finished(output)
 
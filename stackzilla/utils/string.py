@@ -3,7 +3,8 @@
 def removeprefix(string: str, prefix: str) -> str:
     """Remove the prefix of a string.
 
-        str.removeprefix() is not available in prior to Python 3.9
+    Stands in for str.removeprefix(), which is not available prior to Python 3.9.
+
     Args:
         string (str): The string to work on
         prefix (str): The prefix to remove from string